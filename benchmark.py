@@ -0,0 +1,180 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from scheduler import Scheduler
+from memory_manager import MemoryManager, STRATEGIES
+from policies import POLICIES
+from stats import QuantileSketch
+from sweep import comma_separated, format_table, positive_int
+from workload import ARRIVAL_PATTERNS, DEFAULT_MEMORY_MIX, generate_processes, write_json_lines
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Slot sizes for the slab strategy: the common sizes of DEFAULT_MEMORY_MIX
+SLAB_SIZES = tuple(range(DEFAULT_MEMORY_MIX[0][1], DEFAULT_MEMORY_MIX[0][2] + 1, DEFAULT_MEMORY_MIX[0][3]))
+
+
+def peak_rss_kb():
+    """
+    Peak resident set size of this process in KiB, or None where it cannot be measured.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def benchmark_scheduler(count, algorithm, strategy, memory, quantum, seed, arrival):
+    """
+    Simulate count generated processes streamed into the event engine and time the run.
+    Events are process arrivals plus completions.
+    """
+    memory_manager = MemoryManager(total_memory=memory, strategy=strategy, size_classes=SLAB_SIZES)
+    scheduler = Scheduler(memory_manager, algorithm=algorithm, time_quantum=quantum, engine="event",
+                          keep_completed=False, record_trace=False)
+    processes = generate_processes(count, seed=seed, arrival=arrival)
+
+    start = time.perf_counter()
+    scheduler.run(processes, sorted_arrivals=True)
+    seconds = time.perf_counter() - start
+
+    events = count + scheduler.stats.completed
+    return {
+        "benchmark": "scheduler",
+        "processes": count,
+        "scheduler": algorithm,
+        "strategy": strategy,
+        "seconds": seconds,
+        "simulated_ticks": scheduler.time,
+        "ticks_per_sec": scheduler.time / seconds,
+        "events_per_sec": events / seconds,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def benchmark_memory(count, strategy, memory, seed):
+    """
+    Allocate the memory sizes of count generated processes, freeing the oldest allocations
+    whenever one does not fit, and time every allocate call.
+    """
+    memory_manager = MemoryManager(total_memory=memory, strategy=strategy, size_classes=SLAB_SIZES)
+    latencies = QuantileSketch()
+    live = {}  # process_id -> process, in allocation order
+    total_ns = 0
+    failed = 0
+
+    for process in generate_processes(count, seed=seed):
+        if not memory_manager.can_fit(process):
+            failed += 1
+            continue
+        while True:
+            start = time.perf_counter_ns()
+            allocated = memory_manager.allocate(process)
+            elapsed = time.perf_counter_ns() - start
+            latencies.add(elapsed)
+            total_ns += elapsed
+            if allocated:
+                live[process.process_id] = process
+                break
+            oldest = next(iter(live))
+            memory_manager.deallocate(live.pop(oldest))
+
+    return {
+        "benchmark": "memory",
+        "processes": count,
+        "strategy": strategy,
+        "seconds": total_ns / 1e9,
+        "allocations_per_sec": latencies.count / (total_ns / 1e9) if total_ns else 0.0,
+        "alloc_mean_ns": total_ns / latencies.count if latencies.count else None,
+        "alloc_p50_ns": latencies.quantile(0.5),
+        "alloc_p99_ns": latencies.quantile(0.99),
+        "failed": failed,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def run_isolated(function, *args):
+    """
+    Run one benchmark in a fresh worker process so that its peak RSS is its own.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(function, *args).result()
+
+
+def run_benchmarks(scales, algorithms, strategies, memory=8192, quantum=4, seed=0, arrival="poisson"):
+    """
+    Scheduler benchmarks for every scale, algorithm and strategy, then memory manager benchmarks
+    for every scale and strategy. Returns the result rows.
+    """
+    rows = []
+    for count, algorithm, strategy in product(scales, algorithms, strategies):
+        rows.append(run_isolated(benchmark_scheduler, count, algorithm, strategy, memory, quantum, seed, arrival))
+        print(format_table(rows[-1:]).splitlines()[-1], file=sys.stderr)
+    for count, strategy in product(scales, strategies):
+        rows.append(run_isolated(benchmark_memory, count, strategy, memory, seed))
+        print(format_table(rows[-1:]).splitlines()[-1], file=sys.stderr)
+    return rows
+
+
+def run_benchmark_cli():
+    parser = argparse.ArgumentParser(description="OS Scheduler Simulator benchmarks")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run = subcommands.add_parser("run", help="Run the benchmark suite")
+    run.add_argument("--scales", type=comma_separated(int), default=[10 ** 3, 10 ** 4, 10 ** 5],
+                     help="Comma separated workload sizes (number of processes)")
+    run.add_argument("--scheduler", type=comma_separated(str), default=list(POLICIES),
+                     help=f"Comma separated scheduling algorithms ({', '.join(POLICIES)})")
+    run.add_argument("--strategy", type=comma_separated(str), default=list(STRATEGIES),
+                     help=f"Comma separated memory allocation strategies ({', '.join(STRATEGIES)})")
+    run.add_argument("--memory", type=int, default=8192, help="Total memory size")
+    run.add_argument("--quantum", type=positive_int, default=4, help="Time quantum for RR and MLFQ")
+    run.add_argument("--seed", type=int, default=0, help="Workload seed")
+    run.add_argument("--arrival", choices=ARRIVAL_PATTERNS, default="poisson", help="Arrival pattern")
+    run.add_argument("--output", default="benchmark.json", help="JSON file the results are written to")
+
+    generate = subcommands.add_parser("generate", help="Write a synthetic workload as JSON Lines")
+    generate.add_argument("--count", type=int, required=True, help="Number of processes")
+    generate.add_argument("--seed", type=int, default=0, help="Workload seed")
+    generate.add_argument("--arrival", choices=ARRIVAL_PATTERNS, default="poisson", help="Arrival pattern")
+    generate.add_argument("--rate", type=float, default=0.2, help="Mean arrivals per time unit")
+    generate.add_argument("--output", required=True, help="Path of the .jsonl file to write")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        write_json_lines(generate_processes(args.count, seed=args.seed, arrival=args.arrival, rate=args.rate),
+                         args.output)
+        return
+
+    for algorithm in args.scheduler:
+        if algorithm not in POLICIES:
+            parser.error(f"unknown scheduler {algorithm!r}")
+    for strategy in args.strategy:
+        if strategy not in STRATEGIES:
+            parser.error(f"unknown strategy {strategy!r}")
+
+    rows = run_benchmarks(args.scales, args.scheduler, args.strategy, memory=args.memory, quantum=args.quantum,
+                          seed=args.seed, arrival=args.arrival)
+    print(format_table(rows))
+    with open(args.output, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "arrival": args.arrival,
+            "memory": args.memory,
+            "quantum": args.quantum,
+            "results": rows,
+        }, f, indent=2)
+
+
+if __name__ == "__main__":
+    run_benchmark_cli()
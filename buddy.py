@@ -0,0 +1,110 @@
+import heapq
+
+
+class BuddyAllocator:
+    """
+    Free lists of power-of-two blocks for the buddy strategy.
+    Memory is cut into aligned power-of-two regions (1000 = 512 + 256 + 128 + ...); blocks
+    only merge with their buddy inside the same region. For each order there is a min-heap
+    of free starts (lowest address is handed out first) and a bitmap of which starts are
+    free, so the buddy of a freed block is checked in O(1) and heap entries are removed lazily.
+    """
+
+    def __init__(self, total_memory, min_block_size=1):
+        self.min_order = max(0, (min_block_size - 1).bit_length())
+        self.max_order = max(0, total_memory.bit_length() - 1)
+        self.free_lists = [[] for _ in range(self.max_order + 1)]
+        self.free_counts = [0] * (self.max_order + 1)
+        self.bitmaps = [
+            bytearray(((total_memory >> order) >> 3) + 1) if order >= self.min_order else bytearray()
+            for order in range(self.max_order + 1)
+        ]
+
+        # Aligned regions, largest first; each one is the root of its own buddy tree
+        self.regions = []  # (start, order)
+        start = 0
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if total_memory - start >= 1 << order:
+                self.regions.append((start, order))
+                start += 1 << order
+
+    def order_for(self, size):
+        """
+        Smallest order whose block holds size units.
+        """
+        return max(self.min_order, (size - 1).bit_length()) if size > 0 else self.min_order
+
+    def can_fit(self, size):
+        return bool(self.regions) and self.order_for(size) <= self.regions[0][1]
+
+    def region_order(self, start):
+        """
+        Order of the region containing start.
+        """
+        for region_start, order in self.regions:
+            if start < region_start + (1 << order):
+                return order
+        raise ValueError(f"Address {start} is outside the buddy regions")
+
+    def buddy_of(self, start, order):
+        """
+        Start of the buddy block, or None if the block is a whole region.
+        """
+        if order >= self.region_order(start):
+            return None
+        return start ^ (1 << order)
+
+    def is_free(self, start, order):
+        index = start >> order
+        return bool(self.bitmaps[order][index >> 3] & (1 << (index & 7)))
+
+    def push(self, start, order):
+        """
+        Mark a block of the given order as free.
+        """
+        index = start >> order
+        self.bitmaps[order][index >> 3] |= 1 << (index & 7)
+        self.free_counts[order] += 1
+        heapq.heappush(self.free_lists[order], start)
+
+    def discard(self, start, order):
+        """
+        Mark a free block as taken; its heap entry is dropped when it surfaces.
+        """
+        index = start >> order
+        self.bitmaps[order][index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        self.free_counts[order] -= 1
+
+        heap = self.free_lists[order]
+        if len(heap) > 2 * self.free_counts[order] + 32:
+            # Too many stale entries: rebuild the heap from the bitmap state
+            self.free_lists[order] = sorted({s for s in heap if self.is_free(s, order)})
+
+    def take(self, order):
+        """
+        Remove and return (start, order) of the lowest-address free block of at least the given order,
+        searching larger orders when needed. Returns None if there is none.
+        """
+        for current in range(order, self.max_order + 1):
+            heap = self.free_lists[current]
+            while heap:
+                start = heapq.heappop(heap)
+                if self.is_free(start, current):
+                    index = start >> current
+                    self.bitmaps[current][index >> 3] &= ~(1 << (index & 7)) & 0xFF
+                    self.free_counts[current] -= 1
+                    return start, current
+        return None
+
+    def reset(self, free_blocks):
+        """
+        Rebuild the free lists from (start, size) pairs of free power-of-two blocks.
+        """
+        for order in range(self.min_order, self.max_order + 1):
+            self.free_lists[order] = []
+            self.free_counts[order] = 0
+            self.bitmaps[order][:] = bytes(len(self.bitmaps[order]))
+        for start, size in free_blocks:
+            order = size.bit_length() - 1
+            if size == 1 << order and self.min_order <= order <= self.max_order and start % size == 0:
+                self.push(start, order)
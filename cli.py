@@ -1,25 +1,48 @@
 import argparse
+import csv
+import glob
 import json
-from scheduler import Scheduler
-from memory_manager import MemoryManager
-from process import Process
-from visualization import plot_gantt, plot_memory_timeline
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from scheduler import Scheduler, ENGINES, ADMISSION_POLICIES
+from policies import POLICIES
+from smp import SMPScheduler, BALANCING
+from memory_manager import MemoryManager, STRATEGIES, COMPACTING_STRATEGIES
+from workload import JSON_LINES_EXTENSIONS, WorkloadError, process_from_dict, read_processes, arrival_ordered
+from instrumentation import Instrumentation, profiled
+from trace_export import write_trace
+from result_cache import ResultCache
+from sweep import format_table, positive_int
+
+
+CHART_NAMES = ("processes.png", "memory.png")
+# Arguments that only say where outputs go or how runs are organized, not what the results are
+NOT_CACHE_KEYS = ("file", "batch", "output_dir", "workers", "instrument", "profile", "trace_out",
+                  "no_cache", "clear_cache", "cache_dir", "cache_size")
+# Columns of the batch summary printed to the terminal (the summary files have all of them)
+BATCH_TABLE_COLUMNS = ("workload", "completed", "rejected", "makespan", "avg_waiting_time", "avg_turnaround_time",
+                       "throughput", "cpu_utilization", "error")
+
+
+# Errors reading a workload file
+READ_ERRORS = (OSError, WorkloadError, json.JSONDecodeError, KeyError)
+
+
+def read_workload(file_path):
+    if file_path.endswith(JSON_LINES_EXTENSIONS):
+        return list(read_processes(file_path))
+
+    with open(file_path, "r") as f:
+        data = json.load(f)
+
+    return [process_from_dict(p) for p in data["processes"]]
 
 
 def load_processes_from_file(file_path):
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-
-        return [
-            Process(
-                process_id=p["process_id"],
-                arrival_time=p["arrival_time"],
-                burst_time=p["burst_time"],
-                memory_required=p["memory_required"]
-            )
-            for p in data["processes"]
-        ]
+        return read_workload(file_path)
 
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
@@ -34,31 +57,315 @@ def load_processes_from_file(file_path):
         return []
 
 
-def run_simulation():
+def common_sizes(processes, limit=8):
+    """
+    Memory sizes requested by more than one process, most common first.
+    """
+    counts = Counter(p.memory_required for p in processes)
+    return [size for size, count in counts.most_common(limit) if count > 1]
+
+
+def read_failed(file_path, error):
+    """
+    Report a workload that could not be read, as the results of its run.
+    """
+    if isinstance(error, FileNotFoundError):
+        message = f"File '{file_path}' not found."
+    elif isinstance(error, KeyError):
+        message = f"Missing expected key in JSON: {error}"
+    else:
+        message = f"Failed to read processes from '{file_path}': {error}"
+    print(f"Error: {message}")
+    return {"error": message}
+
+
+def print_stats(stats):
+    for key, value in stats.items():
+        print(f"{key}: {value:.2f}")
+
+
+def restore_cached(entry, meta, args, charts):
+    """
+    Put the outputs of a cached run where the run would have written them.
+    Returns False if the entry was evicted meanwhile.
+    """
+    try:
+        if args.trace_out:
+            shutil.copyfile(os.path.join(entry, "trace.npz"), args.trace_out)
+        if meta["charts"]:
+            for name, path in charts.items():
+                shutil.copyfile(os.path.join(entry, name), path)
+    except OSError:
+        return False
+    return True
+
+
+def build_parser():
     parser = argparse.ArgumentParser(description="OS Scheduler Simulator")
-    parser.add_argument("--file", required=True, help="Path to JSON file with processes")
-    parser.add_argument("--scheduler", choices=["FCFS", "RR"], default="FCFS", help="Scheduling algorithm to use")
-    parser.add_argument("--quantum", type=int, default=4, help="Time quantum for Round Robin")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--file", help="Path to JSON file with processes")
+    inputs.add_argument("--batch", metavar="DIR_OR_GLOB",
+                        help="Simulate every workload file in a directory (.json, .jsonl, .ndjson) or matching a "
+                             "glob pattern, in a pool of worker processes")
+    parser.add_argument("--scheduler", choices=list(POLICIES), default="FCFS", help="Scheduling algorithm to use")
+    parser.add_argument("--quantum", type=positive_int, default=4, help="Time quantum for Round Robin (top level quantum for MLFQ)")
     parser.add_argument("--memory", type=int, default=1024, help="Total memory size")
-    parser.add_argument("--strategy", choices=["first_fit", "best_fit"], default="first_fit",
+    parser.add_argument("--strategy", choices=STRATEGIES, default="first_fit",
                         help="Memory allocation strategy")
+    parser.add_argument("--size-classes", type=lambda value: [int(size) for size in value.split(",")],
+                        help="Comma separated slot sizes for the slab strategy "
+                             "(default: sizes requested by more than one process)")
+    parser.add_argument("--compaction-threshold", type=float, default=None,
+                        help="Compact memory when an allocation fails and external fragmentation is at least this "
+                             "ratio (first_fit and best_fit only, disabled by default)")
+    parser.add_argument("--compaction-cost", type=float, default=0.0,
+                        help="Simulated time units charged per byte moved by compaction")
+    parser.add_argument("--engine", choices=ENGINES, default="event",
+                        help="Simulation engine: per time unit (tick), jumping between events (event), or event with a "
+                             "closed-form FCFS shortcut when memory can never block (fast, records no trace)")
+    parser.add_argument("--admission", choices=ADMISSION_POLICIES, default="backfill",
+                        help="Admission of processes waiting for memory: skip ahead (backfill) or strict order (fifo)")
 
-    args = parser.parse_args()
+    parser.add_argument("--cpus", type=positive_int, default=1, help="Number of CPUs sharing the memory")
+    parser.add_argument("--balancing", choices=BALANCING, default="steal",
+                        help="Load balancing with several CPUs: one shared ready queue (global) "
+                             "or per-CPU queues with work stealing (steal)")
 
-    # Setup memory manager with chosen allocation strategy
-    memory_manager = MemoryManager(total_memory=args.memory, strategy=args.strategy)
+    parser.add_argument("--stream", action="store_true",
+                        help="Read processes lazily while simulating instead of loading the whole file; "
+                             "the input must be in arrival order (see --reorder-window)")
+    parser.add_argument("--reorder-window", type=int, default=0,
+                        help="With --stream, how many processes may be buffered to sort slightly out-of-order input")
+
+    parser.add_argument("--instrument", metavar="PATH",
+                        help="Write per-phase call counts and timings, allocation failures and block count "
+                             "high-water marks of the run to this JSON file")
+    parser.add_argument("--profile", metavar="PATH", help="Write a cProfile dump of the run (read it with pstats)")
+    parser.add_argument("--trace-out", metavar="PATH",
+                        help="Write per-process results, execution segments and memory events to this .npz file "
+                             "(read it with trace_export.TraceReader)")
+
+    parser.add_argument("--cache-dir", default=".sim_cache",
+                        help="Directory of cached results: rerunning the same workload file contents with the same "
+                             "options and simulator version restores the stats, trace and charts without simulating")
+    parser.add_argument("--cache-size", type=int, default=512,
+                        help="Cache size limit in MiB, least recently used results are evicted beyond it")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write cached results")
+    parser.add_argument("--clear-cache", action="store_true", help="Remove all cached results before running")
+    parser.add_argument("--no-charts", action="store_true",
+                        help="Print the stats instead of drawing charts. No execution trace is recorded unless "
+                             "--trace-out is given, so with --stream memory use does not grow with the workload")
+
+    parser.add_argument("--output-dir", default="batch",
+                        help="With --batch, directory of the per-workload output directories and the summary")
+    parser.add_argument("--workers", type=int, default=None, help="With --batch, worker processes (default: all CPUs)")
+    return parser
+
+
+def simulate(args, charts_dir="charts"):
+    """
+    Simulate the workload file args.file, write the charts into charts_dir and the optional outputs
+    (--trace-out, --instrument, --profile) to their paths. Returns the run's results:
+    {"stats", "rejected", "closed_form", "charts" (whether charts were drawn), "completed", "time"},
+    or {"error": message} if the workload could not be read.
+    """
+    charts = {name: os.path.join(charts_dir, name) for name in CHART_NAMES}
 
-    # Setup scheduler
-    scheduler = Scheduler(memory_manager, algorithm=args.scheduler, time_quantum=args.quantum)
+    # Runs that are measured (--instrument, --profile) always simulate
+    cache, cache_key = None, None
+    if not (args.no_cache or args.instrument or args.profile):
+        cache = ResultCache(args.cache_dir, max_bytes=args.cache_size << 20)
+        config = {key: value for key, value in vars(args).items() if key not in NOT_CACHE_KEYS}
+        # Entries hold a trace only when one was asked for
+        config["trace"] = bool(args.trace_out)
+        try:
+            cache_key = cache.key(args.file, config)
+        except OSError:
+            cache = None  # Reported when the workload is read below
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None and restore_cached(*cached, args, charts):
+            return cached[1]
 
     # Load processes
-    processes = load_processes_from_file(args.file)
+    try:
+        if args.stream:
+            processes = arrival_ordered(read_processes(args.file), window=args.reorder_window)
+        else:
+            processes = read_workload(args.file)
+    except READ_ERRORS as e:
+        return read_failed(args.file, e)
+
+    # Setup memory manager with chosen allocation strategy
+    if args.size_classes is not None:
+        size_classes = args.size_classes
+    else:
+        # A stream cannot be scanned ahead for common sizes
+        size_classes = [] if args.stream else common_sizes(processes)
+    memory_manager = MemoryManager(total_memory=args.memory, strategy=args.strategy, size_classes=size_classes,
+                                   compaction_threshold=args.compaction_threshold,
+                                   compaction_cost=args.compaction_cost)
+
+    # Setup scheduler, keeping completed processes and recording execution only where outputs need them
+    keep_completed = bool(args.trace_out)
+    record_trace = keep_completed or not args.no_charts
+    if args.cpus > 1:
+        scheduler = SMPScheduler(memory_manager, algorithm=args.scheduler, time_quantum=args.quantum,
+                                 engine=args.engine, admission=args.admission, keep_completed=keep_completed,
+                                 record_trace=record_trace, cpus=args.cpus, balancing=args.balancing)
+    else:
+        scheduler = Scheduler(memory_manager, algorithm=args.scheduler, time_quantum=args.quantum,
+                              engine=args.engine, admission=args.admission, keep_completed=keep_completed,
+                              record_trace=record_trace)
+
+    instrumentation = Instrumentation().attach(scheduler) if args.instrument else None
+    try:
+        with profiled(args.profile):
+            scheduler.run(processes, sorted_arrivals=args.stream)
+    except READ_ERRORS as e:
+        # Streamed workloads are read during the run
+        return read_failed(args.file, e)
+
+    if instrumentation is not None:
+        instrumentation.write_json(args.instrument)
+    if args.trace_out:
+        write_trace(args.trace_out, scheduler)
+
+    results = {
+        "stats": {**scheduler.get_stats(), **memory_manager.get_stats()},
+        "rejected": scheduler.get_rejected_processes(),
+        "closed_form": scheduler.closed_form,
+        "charts": not (scheduler.closed_form or args.no_charts),
+        "completed": scheduler.stats.completed,
+        "time": scheduler.time,
+    }
+    # Visualization; computed in closed form there is no execution trace to chart
+    if results["charts"]:
+        # Imported here so that cached runs do not pay for loading matplotlib
+        from visualization import plot_gantt, plot_memory_timeline
+        core_traces = [core.trace for core in scheduler.cores] if args.cpus > 1 else None
+        plot_gantt(scheduler.trace, results["stats"], results["rejected"], core_traces, path=charts["processes.png"])
+        plot_memory_timeline(scheduler.trace, path=charts["memory.png"])
+
+    if cache is not None:
+        cache.store(cache_key, results, {"trace.npz": args.trace_out, **(charts if results["charts"] else {})})
+    return results
+
+
+def workload_files(pattern):
+    """
+    Workload files of a directory, or the files matching a glob pattern, sorted by path.
+    """
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                 if name.endswith((".json",) + JSON_LINES_EXTENSIONS)]
+    else:
+        paths = glob.glob(pattern)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def output_directories(files, output_dir):
+    """
+    One output directory per workload file, named after the file (numbered if names repeat).
+    """
+    seen = Counter()
+    directories = []
+    for file_path in files:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        seen[name] += 1
+        directories.append(os.path.join(output_dir, name if seen[name] == 1 else f"{name}-{seen[name]}"))
+    return directories
+
+
+def batch_job(args, file_path, directory):
+    """
+    The arguments of one batch workload: optional output files go into its output directory.
+    """
+    job = argparse.Namespace(**vars(args))
+    job.file, job.batch = file_path, None
+    for name in ("trace_out", "instrument", "profile"):
+        if getattr(args, name):
+            setattr(job, name, os.path.join(directory, os.path.basename(getattr(args, name))))
+    return job, directory
+
+
+def run_batch_job(job):
+    """
+    Simulate one batch workload and return its summary row.
+    """
+    args, directory = job
+    os.makedirs(directory, exist_ok=True)
+    results = simulate(args, charts_dir=directory)
+    row = {"workload": args.file, "output_dir": directory}
+    if "error" in results:
+        row["error"] = results["error"]
+        return row
+    return {
+        **row,
+        "completed": results["completed"],
+        "rejected": len(results["rejected"]),
+        "makespan": results["time"],
+        **results["stats"],
+        "rejected_processes": results["rejected"],
+    }
+
+
+def run_batch(args, files):
+    """
+    Simulate every workload file in a pool of worker processes, each of which loads Python modules and
+    matplotlib once for all the workloads it runs. Writes summary.json (every row plus totals) and
+    summary.csv into args.output_dir and returns the rows in file order.
+    """
+    jobs = [batch_job(args, file_path, directory)
+            for file_path, directory in zip(files, output_directories(files, args.output_dir))]
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        rows = [run_batch_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(run_batch_job, jobs))
+
+    succeeded = [row for row in rows if "error" not in row]
+    with open(os.path.join(args.output_dir, "summary.json"), "w") as f:
+        json.dump({
+            "workloads": rows,
+            "totals": {
+                "workloads": len(rows),
+                "failed": len(rows) - len(succeeded),
+                "completed": sum(row["completed"] for row in succeeded),
+                "rejected": sum(row["rejected"] for row in succeeded),
+            },
+        }, f, indent=2)
+
+    # Rejected process ids instead of records in the CSV
+    csv_rows = [{**row, "rejected_processes": " ".join(str(p["process_id"]) for p in row["rejected_processes"])}
+                if "rejected_processes" in row else row for row in rows]
+    with open(os.path.join(args.output_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(dict.fromkeys(key for row in csv_rows for key in row)))
+        writer.writeheader()
+        writer.writerows(csv_rows)
+    return rows
+
+
+def run_simulation():
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.compaction_threshold is not None and args.strategy not in COMPACTING_STRATEGIES:
+        parser.error(f"--compaction-threshold is not supported with --strategy {args.strategy} "
+                     f"(only {', '.join(COMPACTING_STRATEGIES)})")
+    if args.clear_cache:
+        ResultCache(args.cache_dir).clear()
 
-    scheduler.run(processes)
+    if args.batch is None:
+        results = simulate(args)
+        if "error" not in results and not results["charts"]:
+            print_stats(results["stats"])
+        return
 
-    # Visualization
-    plot_gantt(scheduler.execution_log, scheduler.get_stats(), scheduler.get_rejected_processes())
-    plot_memory_timeline(scheduler.execution_log)
+    files = workload_files(args.batch)
+    if not files:
+        parser.error(f"no workload files match {args.batch!r}")
+    rows = run_batch(args, files)
+    print(format_table([{column: row[column] for column in BATCH_TABLE_COLUMNS if column in row} for row in rows]))
 
 
 if __name__ == "__main__":
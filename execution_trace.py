@@ -0,0 +1,100 @@
+from bisect import bisect_right
+
+
+class ExecutionTrace:
+    """
+    Compact record of a simulation run.
+    Execution is stored as run-length encoded (process_id, start, end) segments.
+    Memory is stored as (time, position) marks into the memory manager's delta-encoded
+    timeline, added only when the layout has changed since the previous mark.
+    """
+
+    def __init__(self):
+        self.segments = []  # (process_id, start, end), process_id None = idle
+        self.memory_changes = []  # (time, timeline position)
+        self.memory_timeline = None
+
+    def record(self, process_id, start, end, memory_manager):
+        """
+        Record that process_id (None for idle) ran in [start, end).
+        """
+        if end <= start:
+            return
+
+        timeline = memory_manager.timeline
+        if timeline is not self.memory_timeline or timeline.position != self.memory_changes[-1][1]:
+            self.memory_timeline = timeline
+            self.memory_changes.append((start, timeline.position))
+
+        # Extend the last segment if the same process keeps running
+        if self.segments and self.segments[-1][0] == process_id and self.segments[-1][2] == start:
+            self.segments[-1] = (process_id, self.segments[-1][1], end)
+        else:
+            self.segments.append((process_id, start, end))
+
+    def memory_state_at(self, time):
+        """
+        Return the memory layout in effect at the given time.
+        """
+        index = bisect_right(self.memory_changes, time, key=lambda change: change[0]) - 1
+        if index < 0:
+            return ()
+        return self.memory_timeline.layout_at(self.memory_changes[index][1])
+
+    def memory_snapshots(self):
+        """
+        Yield (time, layout) for every recorded layout change, in time order.
+        """
+        if not self.memory_changes:
+            return
+        layouts = self.memory_timeline.layouts(position for _, position in self.memory_changes)
+        for (time, _), layout in zip(self.memory_changes, layouts):
+            yield time, layout
+
+    def __len__(self):
+        return sum(end - start for _, start, end in self.segments)
+
+
+class NullTrace(ExecutionTrace):
+    """
+    Trace that records nothing, for runs whose memory use must not grow with their length.
+    """
+
+    def record(self, process_id, start, end, memory_manager):
+        pass
+
+
+class ExecutionLog:
+    """
+    Read-only per-time-unit view of an ExecutionTrace.
+    Yields the same {"time", "process_id", "memory_state"} dicts the scheduler used to store.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def __iter__(self):
+        snapshots = self.trace.memory_snapshots()
+        next_snapshot = next(snapshots, None)
+        memory_state = ()
+        for process_id, start, end in self.trace.segments:
+            for time in range(start, end):
+                # Move to the latest snapshot taken at or before this time
+                while next_snapshot is not None and next_snapshot[0] <= time:
+                    memory_state = next_snapshot[1]
+                    next_snapshot = next(snapshots, None)
+                yield {"time": time, "process_id": process_id, "memory_state": list(memory_state)}
+
+    def __len__(self):
+        return len(self.trace)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        for process_id, start, end in self.trace.segments:
+            if index < end - start:
+                time = start + index
+                return {"time": time, "process_id": process_id,
+                        "memory_state": list(self.trace.memory_state_at(time))}
+            index -= end - start
+        raise IndexError("execution log index out of range")
@@ -0,0 +1,113 @@
+import numpy as np
+from process_table import ProcessTable, ProcessRows, MISSING
+
+
+def fcfs_schedule(arrival, burst, start_time=0):
+    """
+    Closed-form FCFS on arrival-ordered arrays: returns (start, completion) arrays.
+    completion[i] = max(arrival[i], completion[i - 1]) + burst[i] unrolls to
+    completion[i] = bursts[0..i] + max(start_time, max over j <= i of (arrival[j] - bursts[0..j-1])),
+    a cumulative sum plus a running maximum.
+    """
+    total = np.cumsum(burst)
+    offset = np.maximum(np.maximum.accumulate(arrival - (total - burst)), start_time)
+    completion = total + offset
+    return completion - burst, completion
+
+
+def memory_never_blocks(memory_manager, memory):
+    """
+    Cheap sufficient condition for every allocation of the given sizes to succeed, in any order.
+    With first fit and best fit, the highest used address never exceeds the sum of all sizes
+    allocated so far: a new block either reuses a hole below it or goes right after it. So if
+    all sizes together fit into empty memory, nothing ever waits.
+    """
+    return (memory_manager.strategy in ("first_fit", "best_fit")
+            and memory_manager.free_memory == memory_manager.total_memory
+            and int(memory.sum()) <= memory_manager.total_memory)
+
+
+def run_fcfs_closed_form(scheduler, processes):
+    """
+    Compute a FCFS run in one vectorized pass when memory can never make a process wait.
+    Fills in the per-process results, completed and rejected processes, the final time and the
+    stats exactly as the simulation would. No execution trace is recorded and the
+    memory manager is left untouched (it would end up empty again anyway).
+    Returns False, changing nothing, when the shortcut does not apply.
+    """
+    if scheduler.algorithm != "FCFS" or not scheduler.closed_form_fcfs:
+        return False
+
+    if isinstance(processes, ProcessTable):
+        table = processes
+        rows = None
+    else:
+        rows = list(processes)
+        table = ProcessTable.from_processes(rows)
+    if len(table) == 0:
+        return False
+
+    arrival = table.numpy_column("arrival_time")
+    burst = table.numpy_column("burst_time")
+    memory = table.numpy_column("memory_required")
+    memory_manager = scheduler.memory_manager
+
+    if np.all(arrival[1:] >= arrival[:-1]) and memory.max() <= memory_manager.total_memory:
+        # Common case: already in arrival order and nothing rejected, work on the columns in place
+        admitted = slice(None)
+        admitted_rows = range(len(table))
+        rejected = np.empty(0, dtype=np.int64)
+    else:
+        order = np.argsort(arrival, kind="stable")  # Same order as sorting by arrival time
+        fits = memory[order] <= memory_manager.total_memory  # What can_fit decides for first fit and best fit
+        admitted = admitted_rows = order[fits]
+        rejected = order[~fits]
+    if not memory_never_blocks(memory_manager, memory[admitted]):
+        return False
+
+    time = scheduler.time
+    start, completion = fcfs_schedule(arrival[admitted], burst[admitted], time)
+    if len(completion):
+        time = max(time, int(completion[-1]))
+    if len(rejected):
+        # The loop pass that rejects the last process still runs (or idles) for one time unit
+        time = max(time, max(int(arrival[rejected[-1]]), scheduler.time) + 1)
+
+    # Arrivals are admitted the moment they arrive (or when the run starts)
+    admission = np.maximum(arrival[admitted], scheduler.time)
+    results = {
+        "remaining_time": 0,
+        "admission_time": admission,
+        "blocked_time": admission - arrival[admitted],
+        "start_time": start,
+        "completion_time": completion,
+        "waiting_time": start - arrival[admitted],
+        "turnaround_time": completion - arrival[admitted],
+    }
+    for name, values in results.items():
+        table.numpy_column(name)[admitted] = values
+
+    if rows is None:
+        if scheduler.keep_completed:
+            scheduler.completed_processes = ProcessRows(table, admitted_rows)
+        scheduler.rejected_processes = [table[row] for row in rejected.tolist()]
+    else:
+        # Copy the results back onto the caller's objects
+        for name in results:
+            column = table.columns[name]
+            for row in admitted_rows:
+                value = column[row]
+                setattr(rows[row], name, None if value == MISSING else value)
+        if scheduler.keep_completed:
+            scheduler.completed_processes = [rows[row] for row in admitted_rows]
+        scheduler.rejected_processes = [rows[row] for row in rejected.tolist()]
+
+    scheduler.time = time
+    scheduler.stats.add_many({
+        "waiting_time": results["waiting_time"],
+        "turnaround_time": results["turnaround_time"],
+        "response_time": start - admission,
+        "blocked_time": results["blocked_time"],
+    }, burst[admitted])
+    scheduler.closed_form = True
+    return True
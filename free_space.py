@@ -0,0 +1,210 @@
+import random
+
+_priorities = random.Random(0)  # Treap priorities, seeded so runs are reproducible
+
+
+class _SizeNode:
+    __slots__ = ("key", "priority", "left", "right")
+
+    def __init__(self, key):
+        self.key = key  # (size, start)
+        self.priority = _priorities.random()
+        self.left = None
+        self.right = None
+
+
+class FreeSizeIndex:
+    """
+    Free blocks in a treap ordered by (size, start), used by best fit.
+    The first entry at or after (size, -1) is the smallest block that fits, lowest address first.
+    Adding and removing a block take O(log n) expected time.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.total = 0  # Sum of all free block sizes
+
+    def add(self, start, size):
+        key = (size, start)
+        left, right = self._split(self.root, key)
+        self.root = self._merge(self._merge(left, _SizeNode(key)), right)
+        self.total += size
+
+    def remove(self, start, size):
+        key = (size, start)
+        left, right = self._split(self.root, key)
+        if right is not None:
+            # right holds every entry at or after key; its leftmost node is the one to drop if present
+            parent, node = None, right
+            while node.left is not None:
+                parent, node = node, node.left
+            if node.key == key:
+                if parent is None:
+                    right = node.right
+                else:
+                    parent.left = node.right
+                self.total -= size
+        self.root = self._merge(left, right)
+
+    def best_fit(self, size):
+        """
+        Return the start of the smallest free block of at least size, or None.
+        """
+        node, found = self.root, None
+        while node is not None:
+            if node.key[0] >= size:
+                found = node
+                node = node.left
+            else:
+                node = node.right
+        return found.key[1] if found is not None else None
+
+    def largest(self):
+        node = self.root
+        if node is None:
+            return 0
+        while node.right is not None:
+            node = node.right
+        return node.key[0]
+
+    def clear(self):
+        self.root = None
+        self.total = 0
+
+    def _split(self, node, key):
+        """
+        Split into (entries < key, entries >= key).
+        """
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self._split(node.right, key)
+            return node, right
+        left, node.left = self._split(node.left, key)
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            return left
+        right.left = self._merge(left, right.left)
+        return right
+
+
+class _Node:
+    __slots__ = ("start", "size", "max_size", "priority", "left", "right")
+
+    def __init__(self, start, size):
+        self.start = start
+        self.size = size
+        self.max_size = size  # Largest free block in this subtree
+        self.priority = _priorities.random()
+        self.left = None
+        self.right = None
+
+    def update(self):
+        max_size = self.size
+        if self.left is not None and self.left.max_size > max_size:
+            max_size = self.left.max_size
+        if self.right is not None and self.right.max_size > max_size:
+            max_size = self.right.max_size
+        self.max_size = max_size
+
+
+class FreeAddressTree:
+    """
+    Free blocks in a treap ordered by start address, each node annotated with the largest
+    free block in its subtree, used by first fit.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, start, size):
+        left, right = self._split(self.root, start)
+        self.root = self._merge(self._merge(left, _Node(start, size)), right)
+
+    def remove(self, start):
+        left, right = self._split(self.root, start)
+        # right holds every block at or after start; drop its leftmost node if it is the one at start
+        right = self._remove_leftmost(right, start)
+        self.root = self._merge(left, right)
+
+    def update(self, start, new_start, size):
+        """
+        Move and resize the block at start in place.
+        new_start must keep the block between the same neighbours in address order.
+        """
+        path = []
+        node = self.root
+        while node is not None and node.start != start:
+            path.append(node)
+            node = node.left if start < node.start else node.right
+        if node is None:
+            return
+        node.start = new_start
+        node.size = size
+        node.update()
+        for parent in reversed(path):
+            parent.update()
+
+    def first_fit(self, size):
+        """
+        Return the start of the lowest-address free block of at least size, or None.
+        """
+        node = self.root
+        if node is None or node.max_size < size:
+            return None
+        while True:
+            if node.left is not None and node.left.max_size >= size:
+                node = node.left
+            elif node.size >= size:
+                return node.start
+            else:
+                node = node.right
+
+    def largest(self):
+        return self.root.max_size if self.root is not None else 0
+
+    def clear(self):
+        self.root = None
+
+    def _split(self, node, start):
+        """
+        Split into (nodes with start < start, nodes with start >= start).
+        """
+        if node is None:
+            return None, None
+        if node.start < start:
+            node.right, right = self._split(node.right, start)
+            node.update()
+            return node, right
+        left, node.left = self._split(node.left, start)
+        node.update()
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    def _remove_leftmost(self, node, start):
+        if node is None:
+            return None
+        if node.left is None:
+            return node.right if node.start == start else node
+        node.left = self._remove_leftmost(node.left, start)
+        node.update()
+        return node
@@ -0,0 +1,116 @@
+import cProfile
+import json
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+
+class Instrumentation:
+    """
+    Per-phase call counters and cumulative timers for a scheduler and its memory manager.
+    attach() replaces the hot methods on the given instances with timed wrappers and detach()
+    removes them again, so an uninstrumented run executes exactly the same code as before.
+    Times are inclusive: e.g. admit_arrived includes the add_process and allocate calls it makes.
+    """
+
+    SCHEDULER_PHASES = ("admit_arrived", "has_pending_arrival", "retry_waiting", "add_process", "dispatch",
+                        "dispatch_on", "schedule_cores", "run_cores", "complete_process", "log_execution")
+    MEMORY_PHASES = ("allocate", "deallocate", "can_fit", "compact", "coalesce", "merge_free_blocks")
+
+    def __init__(self):
+        self.calls = {}  # Phase -> number of calls
+        self.time_ns = {}  # Phase -> total time spent in it
+        self.allocation_attempts = 0
+        self.allocation_failures = 0
+        self.peak_free_blocks = 0
+        self.peak_allocations = 0  # Processes holding memory at the same time
+        self.wrapped = []  # (instance, method name)
+
+    def attach(self, scheduler):
+        """
+        Instrument the scheduler, its memory manager and the memory manager's timeline.
+        """
+        for name in self.SCHEDULER_PHASES:
+            if hasattr(scheduler, name):
+                self.wrap(scheduler, name, f"scheduler.{name}")
+
+        memory_manager = scheduler.memory_manager
+        for name in self.MEMORY_PHASES:
+            self.wrap(memory_manager, name, f"memory.{name}",
+                      after=lambda result, name=name: self.on_memory_call(memory_manager, name, result))
+        # Recording the layout changes that back the memory snapshots
+        self.wrap(memory_manager.timeline, "record", "memory.timeline_record")
+        return self
+
+    def detach(self):
+        """
+        Restore the original methods.
+        """
+        for instance, name in self.wrapped:
+            del instance.__dict__[name]
+        self.wrapped = []
+
+    def wrap(self, instance, name, phase, after=None):
+        method = getattr(instance, name)
+        calls, time_ns = self.calls, self.time_ns
+        calls.setdefault(phase, 0)
+        time_ns.setdefault(phase, 0)
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            result = method(*args, **kwargs)
+            time_ns[phase] += perf_counter_ns() - start
+            calls[phase] += 1
+            if after is not None:
+                after(result)
+            return result
+
+        setattr(instance, name, timed)
+        self.wrapped.append((instance, name))
+
+    def on_memory_call(self, memory_manager, name, result):
+        if name == "allocate":
+            self.allocation_attempts += 1
+            if not result:
+                self.allocation_failures += 1
+        elif name != "deallocate":
+            return
+        self.peak_free_blocks = max(self.peak_free_blocks, memory_manager.free_block_count)
+        self.peak_allocations = max(self.peak_allocations, len(memory_manager.blocks_by_pid))
+
+    def to_dict(self):
+        return {
+            "phases": {
+                phase: {
+                    "calls": calls,
+                    "total_ms": self.time_ns[phase] / 1e6,
+                    "mean_us": self.time_ns[phase] / calls / 1e3 if calls else 0.0,
+                }
+                for phase, calls in self.calls.items()
+            },
+            "allocation_attempts": self.allocation_attempts,
+            "allocation_failures": self.allocation_failures,
+            "peak_free_blocks": self.peak_free_blocks,
+            "peak_allocations": self.peak_allocations,
+        }
+
+    def write_json(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+@contextmanager
+def profiled(file_path=None):
+    """
+    Run the body under cProfile and dump the stats to file_path (readable with pstats).
+    Does nothing without a file path.
+    """
+    if file_path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(file_path)
@@ -1,9 +1,23 @@
+import math
+from bisect import bisect_left
+from buddy import BuddyAllocator
+from free_space import FreeSizeIndex, FreeAddressTree
+from memory_timeline import MemoryTimeline, NullTimeline
+from slab import Slab, SizeClass
+
+STRATEGIES = ("first_fit", "best_fit", "buddy", "slab")
+COMPACTING_STRATEGIES = ("first_fit", "best_fit")  # Strategies that support compaction
+
+
 class MemoryBlock:
     def __init__(self, start, size, is_free=True, process_id=None):
         self.start = start
         self.size = size
         self.is_free = is_free
         self.process_id = process_id
+        self.prev = None  # Neighbouring blocks in address order
+        self.next = None
+        self.slab = None  # Slab owning this block if it is a slot, free slots stay out of the free indexes
 
     def __repr__(self):
         status = "Free" if self.is_free else f"Used by PID {self.process_id}"
@@ -11,10 +25,60 @@ class MemoryBlock:
 
 
 class MemoryManager:
-    def __init__(self, total_memory, strategy="first_fit"):
+    def __init__(self, total_memory, strategy="first_fit", keyframe_interval=256, min_block_size=None,
+                 size_classes=(), compaction_threshold=None, compaction_cost=0.0, record_timeline=True):
         self.total_memory = total_memory
         self.strategy = strategy
-        self.blocks = [MemoryBlock(0, total_memory)]  # Initially, all memory is free
+
+        # Compaction: when an allocation fails although enough memory is free in total and the
+        # external fragmentation ratio is at least compaction_threshold, used blocks are slid down
+        # to merge all free space. Moving costs compaction_cost time units per byte.
+        if compaction_threshold is not None and strategy not in COMPACTING_STRATEGIES:
+            raise ValueError(f"Compaction is not supported for the {strategy} strategy")
+        self.compaction_threshold = compaction_threshold
+        self.compaction_cost = compaction_cost
+        self.compactions = 0
+        self.compaction_bytes_moved = 0
+        self.compaction_time = 0
+        self.pending_compaction_time = 0  # Stall not yet charged by the scheduler
+        self.free_by_size = FreeSizeIndex()  # Free blocks ordered by size, for best fit
+        self.free_by_address = FreeAddressTree()  # Free blocks ordered by address, for first fit
+        self.free_blocks = {}  # start -> free block, resolves index lookups to blocks
+        self.blocks_by_pid = {}  # process_id -> blocks allocated to it
+        self.head = None  # Lowest-address block, the rest are reached through next
+        self.timeline = None
+
+        # Memory handed out vs. memory asked for, the difference is internal fragmentation
+        self.requested_by_pid = {}
+        self.allocated_memory = 0
+        self.requested_memory = 0
+        self.total_allocated = 0
+        self.total_requested = 0
+        self.peak_internal_fragmentation = 0
+
+        # Slab strategy: sizes served from per-class slots, everything else goes through first fit
+        self.size_classes = {}
+        if strategy == "slab":
+            for size in sorted(set(size_classes)):
+                # Slabs of up to 32 slots, but no more than 1/16 of memory unless a single slot needs it
+                slab_bytes = max(size, min(total_memory // 16, size * 32))
+                self.size_classes[size] = SizeClass(size, slab_bytes // size)
+        self.class_sizes = sorted(self.size_classes)
+
+        self.buddy = None
+        if strategy == "buddy":
+            # Smallest buddy block bounds the bitmaps to ~2^16 entries per order
+            self.buddy = BuddyAllocator(total_memory, min_block_size or max(1, total_memory >> 16))
+            self.blocks = [MemoryBlock(start, 1 << order) for start, order in self.buddy.regions]
+            tail = sum(block.size for block in self.blocks)
+            if tail < total_memory:
+                # Leftover smaller than the minimum buddy block, never handed out
+                self.blocks = self.blocks + [MemoryBlock(tail, total_memory - tail)]
+        else:
+            self.blocks = [MemoryBlock(0, total_memory)]  # Initially, all memory is free
+        self.free_listeners = []  # Callbacks invoked with the process whenever deallocate frees memory
+        # Split/free/merge event stream; not recorded with record_timeline=False
+        self.timeline = (MemoryTimeline if record_timeline else NullTimeline)(self.blocks, keyframe_interval)
 
     def allocate(self, process):
         """
@@ -22,91 +86,520 @@ class MemoryManager:
         Returns True if successful, False otherwise.
         """
         if self.strategy == "first_fit":
-            return self.first_fit(process)
+            return self.first_fit(process) or (self.should_compact(process) and self.compact()
+                                               and self.first_fit(process))
         elif self.strategy == "best_fit":
-            return self.best_fit(process)
+            return self.best_fit(process) or (self.should_compact(process) and self.compact()
+                                              and self.best_fit(process))
+        elif self.strategy == "buddy":
+            return self.buddy_fit(process)
+        elif self.strategy == "slab":
+            return self.slab_fit(process)
         else:
             raise ValueError(f"Unknown allocation strategy: {self.strategy}")
-        pass
+
+    def can_fit(self, process):
+        """
+        Whether the process could ever be allocated, i.e. once all memory is free.
+        """
+        if self.buddy is not None:
+            return self.buddy.can_fit(process.memory_required)
+        return process.memory_required <= self.total_memory
+
+    @property
+    def free_memory(self):
+        """
+        Total size of free blocks, not counting free slab slots.
+        """
+        return self.free_by_size.total
+
+    @property
+    def largest_free_block(self):
+        return self.free_by_size.largest()
+
+    @property
+    def free_block_count(self):
+        return len(self.free_blocks)
+
+    @property
+    def external_fragmentation(self):
+        """
+        Share of free memory outside the largest free block: 0 when all free memory is contiguous.
+        """
+        free_memory = self.free_memory
+        return 1 - self.largest_free_block / free_memory if free_memory else 0.0
+
+    def should_compact(self, process):
+        """
+        Whether a failed allocation is due to external fragmentation bad enough to compact.
+        """
+        return (self.compaction_threshold is not None
+                and process.memory_required <= self.free_memory
+                and self.external_fragmentation >= self.compaction_threshold)
+
+    def compact(self):
+        """
+        Slide every used block down to the lowest free address, leaving one free block at the end.
+        The time it takes is added to pending_compaction_time. Returns True.
+        """
+        used = [block for block in self.iter_blocks() if not block.is_free]
+        moved = 0
+        start = 0
+        for block in used:
+            if block.start != start:
+                moved += block.size
+                block.start = start
+            start += block.size
+
+        self.free_by_size.clear()
+        self.free_by_address.clear()
+        self.free_blocks = {}
+        blocks = used + [MemoryBlock(start, self.total_memory - start)] if start < self.total_memory else used
+        self.link_blocks(blocks)
+        if blocks and blocks[-1].is_free:
+            self.index_free(blocks[-1])
+        self.timeline.record([("compact",)], self.iter_blocks())
+
+        cost = math.ceil(moved * self.compaction_cost)
+        self.compactions += 1
+        self.compaction_bytes_moved += moved
+        self.compaction_time += cost
+        self.pending_compaction_time += cost
+
+        # All free memory is now one block, processes waiting for memory may fit
+        for listener in self.free_listeners:
+            listener(None)
+        return True
+
+    def take_compaction_time(self):
+        """
+        Return and reset the compaction time the scheduler has not charged yet.
+        """
+        stall = self.pending_compaction_time
+        self.pending_compaction_time = 0
+        return stall
+
+    def get_stats(self):
+        """
+        Return internal fragmentation and compaction statistics over all allocations so far.
+        """
+        stats = {
+            "internal_fragmentation_ratio":
+                1 - self.total_requested / self.total_allocated if self.total_allocated else 0.0,
+            "peak_internal_fragmentation": self.peak_internal_fragmentation,
+        }
+        if self.compaction_threshold is not None:
+            stats["compactions"] = self.compactions
+            stats["compaction_bytes_moved"] = self.compaction_bytes_moved
+            stats["compaction_time"] = self.compaction_time
+        for size, class_stats in self.slab_stats().items():
+            stats[f"slab_{size}_peak_used"] = class_stats["peak_used"]
+            stats[f"slab_{size}_avg_waste"] = class_stats["avg_waste_per_allocation"]
+        return stats
+
+    def slab_stats(self):
+        """
+        Return occupancy and waste per size class.
+        """
+        return {size: size_class.get_stats() for size, size_class in self.size_classes.items()}
+
+    @property
+    def blocks(self):
+        """
+        All memory blocks ordered by start address.
+        """
+        return list(self.iter_blocks())
+
+    @blocks.setter
+    def blocks(self, blocks):
+        # Relink the given blocks and rebuild every index from scratch
+        self.link_blocks(blocks)
+        self.free_by_size.clear()
+        self.free_by_address.clear()
+        self.free_blocks = {}
+        self.blocks_by_pid = {}
+        self.requested_by_pid = {}
+        self.allocated_memory = self.requested_memory = 0
+
+        for block in blocks:
+            if block.is_free:
+                self.index_free(block)
+            else:
+                self.blocks_by_pid.setdefault(block.process_id, []).append(block)
+                self.requested_by_pid[block.process_id] = self.requested_by_pid.get(block.process_id, 0) + block.size
+                self.allocated_memory += block.size
+                self.requested_memory += block.size
+
+        for size_class in self.size_classes.values():
+            size_class.clear()
+        if self.buddy is not None:
+            self.buddy.reset((block.start, block.size) for block in blocks if block.is_free)
+        if self.timeline is not None:
+            self.timeline.reset(blocks)
+
+    def link_blocks(self, blocks):
+        """
+        Chain the given blocks, in address order, into the block list.
+        """
+        self.head = blocks[0] if blocks else None
+        prev = None
+        for block in blocks:
+            block.prev = prev
+            block.next = None
+            if prev is not None:
+                prev.next = block
+            prev = block
+
+    def iter_blocks(self):
+        block = self.head
+        while block is not None:
+            yield block
+            block = block.next
+
+    def index_free(self, block):
+        self.free_by_size.add(block.start, block.size)
+        self.free_by_address.add(block.start, block.size)
+        self.free_blocks[block.start] = block
+
+    def unindex_free(self, block):
+        self.free_by_size.remove(block.start, block.size)
+        self.free_by_address.remove(block.start)
+        self.free_blocks.pop(block.start, None)
 
     def deallocate(self, process):
         """
         Frees the memory occupied by the given process.
+        Only the freed blocks and their immediate neighbours are touched.
         """
-        for block in self.blocks:
-            if not block.is_free and block.process_id == process.process_id:
-                block.is_free = True
-                block.process_id = None
+        blocks = self.blocks_by_pid.pop(process.process_id, [])
+        requested = self.requested_by_pid.pop(process.process_id, 0)
+        self.requested_memory -= requested
+        for block in blocks:
+            block.is_free = True
+            block.process_id = None
+            self.allocated_memory -= block.size
+            if block.slab is None:
+                self.index_free(block)
+            self.timeline.record([("free", block.start)], self.iter_blocks())
 
-        self.merge_free_blocks()
+        for block in blocks:
+            if block.prev is None and block is not self.head:
+                continue  # Already absorbed by a neighbour freed in this call
+            if block.slab is not None:
+                self.slab_free(block, requested)
+            elif self.buddy is not None:
+                self.buddy_free(block)
+            else:
+                self.coalesce(block)
+
+        # Wake up whoever is waiting for memory
+        if blocks:
+            for listener in self.free_listeners:
+                listener(process)
+
+    def coalesce(self, block):
+        """
+        Merge a free block with its free neighbours; slots are never merged.
+        Returns the resulting block.
+        """
+        # Coalesce with the following block, then let the preceding block absorb this one
+        if block.next is not None and block.next.is_free and block.next.slab is None:
+            self.absorb_next(block)
+        if block.prev is not None and block.prev.is_free and block.prev.slab is None:
+            block = block.prev
+            self.absorb_next(block)
+        return block
 
     def first_fit(self, process):
         """
         Finds the first free block large enough and allocates it.
         """
-        for i, block in enumerate(self.blocks):
-            if block.is_free and block.size >= process.memory_required:
-                allocated_block = MemoryBlock(
-                    block.start, process.memory_required,
-                    is_free=False, process_id=process.process_id
-                )
-                self.split_block(allocated_block, process, i)
-                return True
-        return False
+        start = self.free_by_address.first_fit(process.memory_required)
+        if start is None:
+            return False
+
+        allocated_block = MemoryBlock(
+            start, process.memory_required,
+            is_free=False, process_id=process.process_id
+        )
+        self.split_free_block(self.free_blocks[start], allocated_block)
+        return True
 
     def best_fit(self, process):
         """
         Finds the smallest free block that fits the process.
         """
-        best_index = -1
-        min_fit_size = self.total_memory + 1
+        start = self.free_by_size.best_fit(process.memory_required)
+        if start is None:
+            return False  # No suitable block found
 
-        for i, block in enumerate(self.blocks):
-            if block.is_free and block.size >= process.memory_required:
-                if block.size < min_fit_size:
-                    best_index = i
-                    min_fit_size = block.size
+        allocated_block = MemoryBlock(
+            start, process.memory_required,
+            is_free=False, process_id=process.process_id
+        )
+        self.split_free_block(self.free_blocks[start], allocated_block)
+        return True
 
-        if best_index == -1:
-            return False  # No suitable block found
+    def buddy_fit(self, process):
+        """
+        Hands out the lowest-address free power-of-two block of the smallest sufficient order,
+        halving a larger block down to that order when needed.
+        """
+        order = self.buddy.order_for(process.memory_required)
+        found = self.buddy.take(order)
+        if found is None:
+            return False
+
+        start, found_order = found
+        free_block = self.free_blocks[start]
+        while found_order > order:
+            # Keep the lower half, the upper half becomes a free buddy one order down
+            found_order -= 1
+            self.divide_free_block(free_block, 1 << found_order)
+            self.buddy.push(start + (1 << found_order), found_order)
 
         allocated_block = MemoryBlock(
-            self.blocks[best_index].start, process.memory_required,
+            start, 1 << order,
             is_free=False, process_id=process.process_id
         )
+        self.split_free_block(free_block, allocated_block, process.memory_required)
+        return True
+
+    def buddy_free(self, block):
+        """
+        Merge a freed buddy block with its buddy for as long as the buddy is free and whole.
+        """
+        order = self.buddy.order_for(block.size)
+        while True:
+            buddy_start = self.buddy.buddy_of(block.start, order)
+            if buddy_start is None or not self.buddy.is_free(buddy_start, order):
+                break
+            self.buddy.discard(buddy_start, order)
+            if buddy_start < block.start:
+                block = self.free_blocks[buddy_start]
+            self.absorb_next(block)
+            order += 1
+        self.buddy.push(block.start, order)
+
+    def slab_fit(self, process):
+        """
+        Serves sizes close to a size class from that class's slots, carving a new slab when
+        all of them are taken. Other sizes, and classes that cannot get a slab, use first fit.
+        """
+        size_class = self.size_class_for(process.memory_required)
+        if size_class is None:
+            return self.general_fit(process)
+
+        slot = size_class.take_slot()
+        if slot is None:
+            if not self.carve_slab(size_class):
+                return self.general_fit(process)
+            slot = size_class.take_slot()
 
-        self.split_block(allocated_block, process, best_index)
+        slot.is_free = False
+        slot.process_id = process.process_id
+        size_class.requested += process.memory_required
+        size_class.allocations += 1
+        size_class.total_waste += slot.size - process.memory_required
+        self.account_allocation(slot, process.memory_required)
+        self.blocks_by_pid.setdefault(process.process_id, []).append(slot)
+        self.timeline.record([("split", slot.start, slot.size, process.process_id)], self.iter_blocks())
+        return True
+
+    def size_class_for(self, size):
+        """
+        Smallest size class that holds size while wasting at most 1/8 of a slot, or None.
+        """
+        i = bisect_left(self.class_sizes, size)
+        if i == len(self.class_sizes) or self.class_sizes[i] - size > self.class_sizes[i] // 8:
+            return None
+        return self.size_classes[self.class_sizes[i]]
 
+    def general_fit(self, process):
+        """
+        First fit for sizes without a slab, giving back cached empty slabs if memory is short.
+        """
+        if self.first_fit(process):
+            return True
+        return self.reclaim_slabs() and self.first_fit(process)
+
+    def carve_slab(self, size_class):
+        """
+        Cut a new slab for the size class out of free memory, with fewer slots if space is tight.
+        Returns False if not even a single slot fits.
+        """
+        size = size_class.size
+        slots = size_class.slots_per_slab
+        start = None
+        while slots and start is None:
+            start = self.free_by_address.first_fit(slots * size)
+            if start is None:
+                slots //= 2
+        if start is None:
+            if not self.reclaim_slabs():
+                return False
+            slots = 1
+            start = self.free_by_address.first_fit(size)
+            if start is None:
+                return False
+
+        region = self.free_blocks[start]
+        if region.size > slots * size:
+            self.divide_free_block(region, slots * size)
+        self.unindex_free(region)
+
+        # Cut the region into slots; they stay free but out of the general free indexes
+        slot_blocks = [region]
+        events = []
+        for _ in range(slots - 1):
+            slot = slot_blocks[-1]
+            rest = MemoryBlock(slot.start + size, slot.size - size, True)
+            self.link_after(slot, rest)
+            slot.size = size
+            events.append(("divide", slot.start, size))
+            slot_blocks.append(rest)
+        if events:
+            self.timeline.record(events, self.iter_blocks())
+
+        slab = Slab(size_class, slot_blocks)
+        for slot in slot_blocks:
+            slot.slab = slab
+        size_class.add_slab(slab)
         return True
 
+    def slab_free(self, slot, requested):
+        """
+        Return a slot to its slab and release the slab if the size class has another empty one.
+        """
+        size_class = slot.slab.size_class
+        size_class.requested -= requested
+        empty_slab = size_class.return_slot(slot)
+        if empty_slab is not None:
+            self.release_slab(empty_slab)
+
+    def release_slab(self, slab):
+        """
+        Turn the slots of an empty slab back into one general free block.
+        """
+        slab.size_class.remove_slab(slab)
+        first = slab.slots[0]
+        for slot in slab.slots:
+            slot.slab = None
+        self.index_free(first)
+        for _ in range(len(slab.slots) - 1):
+            self.absorb_next(first)
+        self.coalesce(first)
+
+    def reclaim_slabs(self):
+        """
+        Release the empty slab each size class keeps cached. Returns True if any memory came back.
+        """
+        released = False
+        for size_class in self.size_classes.values():
+            if size_class.empty_slab is not None:
+                self.release_slab(size_class.empty_slab)
+                released = True
+        return released
+
     def split_block(self, allocated_block, process, block_index):
-        remaining_size = self.blocks[block_index].size - process.memory_required
+        self.split_free_block(self.blocks[block_index], allocated_block)
+
+    def link_after(self, block, new_block):
+        """
+        Insert new_block into the block list right after block.
+        """
+        new_block.prev = block
+        new_block.next = block.next
+        if block.next is not None:
+            block.next.prev = new_block
+        block.next = new_block
+
+    def divide_free_block(self, free_block, size):
+        """
+        Shrink a free block to size units, the rest becomes a new free block right after it.
+        """
+        rest = MemoryBlock(free_block.start + size, free_block.size - size, True)
+        self.link_after(free_block, rest)
+
+        self.free_by_size.remove(free_block.start, free_block.size)
+        free_block.size = size
+        self.free_by_size.add(free_block.start, size)
+        self.free_by_address.update(free_block.start, free_block.start, size)
+        self.index_free(rest)
+        self.timeline.record([("divide", free_block.start, size)], self.iter_blocks())
+
+    def account_allocation(self, block, requested):
+        """
+        Track what was handed out against what the process asked for.
+        """
+        self.requested_by_pid[block.process_id] = self.requested_by_pid.get(block.process_id, 0) + requested
+        self.requested_memory += requested
+        self.allocated_memory += block.size
+        self.total_requested += requested
+        self.total_allocated += block.size
+        self.peak_internal_fragmentation = max(self.peak_internal_fragmentation,
+                                               self.allocated_memory - self.requested_memory)
+
+    def split_free_block(self, free_block, allocated_block, requested=None):
+        """
+        Replace free_block with allocated_block, keeping any leftover space as a new free block after it.
+        requested is what the process asked for if the strategy handed out more (internal fragmentation).
+        """
+        self.account_allocation(allocated_block, allocated_block.size if requested is None else requested)
+
+        # Put the allocated block in place of the free one
+        allocated_block.prev = free_block.prev
+        allocated_block.next = free_block.next
+        if free_block.prev is not None:
+            free_block.prev.next = allocated_block
+        else:
+            self.head = allocated_block
+        if free_block.next is not None:
+            free_block.next.prev = allocated_block
+
+        remaining_size = free_block.size - allocated_block.size
         if remaining_size > 0:
             # If there's leftover space, split the block
-            remaining_block = MemoryBlock(
-                allocated_block.start + process.memory_required,
-                remaining_size, True
-            )
-            self.blocks[block_index:block_index + 1] = [allocated_block, remaining_block]
+            remaining_block = MemoryBlock(allocated_block.start + allocated_block.size, remaining_size, True)
+            self.link_after(allocated_block, remaining_block)
+            # The leftover keeps the free block's place in address order, so move it in the indexes
+            self.free_by_size.remove(free_block.start, free_block.size)
+            self.free_by_size.add(remaining_block.start, remaining_size)
+            self.free_by_address.update(free_block.start, remaining_block.start, remaining_size)
+            del self.free_blocks[free_block.start]
+            self.free_blocks[remaining_block.start] = remaining_block
         else:
-            # No leftover space, occupy the full block
-            self.blocks[block_index] = allocated_block
+            self.unindex_free(free_block)
 
-    def merge_free_blocks(self):
+        self.blocks_by_pid.setdefault(allocated_block.process_id, []).append(allocated_block)
+        self.timeline.record([("split", allocated_block.start, allocated_block.size, allocated_block.process_id)],
+                             self.iter_blocks())
+
+    def absorb_next(self, block):
         """
-        Merges adjacent free blocks into a single block to reduce fragmentation.
+        Merge the free block right after the given free block into it.
         """
-        merged_blocks = []
-        i = 0
+        following = block.next
+        self.unindex_free(following)
+        self.free_by_size.remove(block.start, block.size)
 
-        while i < len(self.blocks):
-            current = self.blocks[i]
-            while (i + 1) < len(self.blocks) and current.is_free and self.blocks[i+1].is_free:
-                current.size += self.blocks[i + 1].size
-                i += 1
-            merged_blocks.append(current)
-            i += 1
-
-        self.blocks = merged_blocks
+        block.size += following.size
+        block.next = following.next
+        if following.next is not None:
+            following.next.prev = block
+        following.prev = following.next = None
 
+        self.free_by_size.add(block.start, block.size)
+        self.free_by_address.update(block.start, block.start, block.size)
+        self.timeline.record([("merge", block.start)], self.iter_blocks())
 
+    def merge_free_blocks(self):
+        """
+        Merges adjacent free blocks into a single block to reduce fragmentation.
+        """
+        block = self.head
+        while block is not None:
+            while (block.is_free and block.slab is None and block.next is not None
+                   and block.next.is_free and block.next.slab is None):
+                self.absorb_next(block)
+            block = block.next
@@ -0,0 +1,130 @@
+from bisect import bisect_left
+
+
+class MemoryTimeline:
+    """
+    Delta-encoded history of a memory layout.
+    The memory manager appends split/free/merge events; a full keyframe of the layout
+    is stored once keyframe_interval events (and at least as many events as the last keyframe
+    had blocks) have passed since the last one, so any point can be rebuilt by seeking to the
+    nearest keyframe and replaying forward.
+
+    Events:
+        ("split", start, size, process_id) - the free block at start gives its first size units to process_id
+        ("free", start)                    - the block at start becomes free
+        ("merge", start)                   - the block at start absorbs the block right after it
+        ("divide", start, size)            - the free block at start keeps size units, the rest becomes a free block
+        ("compact",)                       - used blocks slide down to address 0, one free block is left at the end
+    """
+
+    def __init__(self, blocks, keyframe_interval=256):
+        self.keyframe_interval = keyframe_interval
+        self.events = []
+        self.keyframes = [(0, self.snapshot(blocks))]  # (position, layout)
+
+    @staticmethod
+    def snapshot(blocks):
+        return tuple((block.start, block.size, block.is_free, block.process_id) for block in blocks)
+
+    @property
+    def position(self):
+        """
+        Number of events recorded so far; a layout is identified by the position it was reached at.
+        """
+        return len(self.events)
+
+    def record(self, events, blocks):
+        """
+        Append a batch of events; blocks is the layout after all of them, used when a keyframe is due.
+        """
+        self.events.extend(events)
+        last_position, last_keyframe = self.keyframes[-1]
+        since = len(self.events) - last_position
+        # A keyframe costs O(blocks), so with a fragmented layout they are spaced at least that many events apart
+        if since >= self.keyframe_interval and since >= len(last_keyframe):
+            self.keyframes.append((len(self.events), self.snapshot(blocks)))
+
+    def reset(self, blocks):
+        """
+        Store a keyframe for a layout that was replaced wholesale rather than through events.
+        """
+        self.keyframes.append((len(self.events), self.snapshot(blocks)))
+
+    def layout_at(self, position):
+        """
+        Return the layout as (start, size, is_free, process_id) tuples after the first position events.
+        """
+        return next(self.layouts([position]))
+
+    def layouts(self, positions):
+        """
+        Yield the layout for each of the given ascending positions, replaying events only once.
+        """
+        keyframe_positions = [pos for pos, _ in self.keyframes]
+        layout = None
+        current = None
+
+        for position in positions:
+            # Jump to the latest keyframe at or before position if it is ahead of the replay
+            index = bisect_left(keyframe_positions, position + 1) - 1
+            if current is None or current > position or keyframe_positions[index] > current:
+                current, keyframe = self.keyframes[index]
+                layout = [list(block) for block in keyframe]
+
+            while current < position:
+                self.apply(layout, self.events[current])
+                current += 1
+
+            yield tuple(tuple(block) for block in layout)
+
+    @staticmethod
+    def apply(layout, event):
+        """
+        Apply one event to a layout held as a list of [start, size, is_free, process_id] lists.
+        """
+        kind = event[0]
+        if kind == "compact":
+            used = [block for block in layout if not block[2]]
+            total = sum(block[1] for block in layout)
+            layout.clear()
+            start = 0
+            for block in used:
+                layout.append([start, block[1], False, block[3]])
+                start += block[1]
+            if start < total:
+                layout.append([start, total - start, True, None])
+            return
+
+        index = bisect_left(layout, event[1], key=lambda block: block[0])
+        block = layout[index]
+
+        if kind == "split":
+            size, process_id = event[2], event[3]
+            remaining = block[1] - size
+            layout[index] = [block[0], size, False, process_id]
+            if remaining > 0:
+                layout.insert(index + 1, [block[0] + size, remaining, True, None])
+        elif kind == "free":
+            block[2] = True
+            block[3] = None
+        elif kind == "merge":
+            block[1] += layout[index + 1][1]
+            del layout[index + 1]
+        elif kind == "divide":
+            size = event[2]
+            layout.insert(index + 1, [block[0] + size, block[1] - size, True, None])
+            block[1] = size
+        else:
+            raise ValueError(f"Unknown memory event: {kind}")
+
+
+class NullTimeline(MemoryTimeline):
+    """
+    Timeline that records no events, only the initial layout.
+    """
+
+    def record(self, events, blocks):
+        pass
+
+    def reset(self, blocks):
+        pass
@@ -0,0 +1,228 @@
+import heapq
+from collections import deque
+from itertools import count
+
+
+POLICIES = {}  # Algorithm name -> policy class, filled by @register_policy
+
+
+def register_policy(cls):
+    """
+    Class decorator adding a scheduling policy to the registry under its name.
+    """
+    POLICIES[cls.name] = cls
+    return cls
+
+
+def create_policy(algorithm, time_quantum=None):
+    """
+    Build the ready queue for the named scheduling algorithm.
+    """
+    if algorithm not in POLICIES:
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+    return POLICIES[algorithm](time_quantum)
+
+
+class SchedulingPolicy:
+    """
+    Ready queue of a scheduling algorithm: decides which ready process runs next and for how long.
+    The scheduler loop only talks to this interface, so adding an algorithm means adding a subclass.
+    """
+    name = None
+    preemptive = False  # Whether a newly admitted process can take the CPU from the running one
+    admit_after_tick = False  # Admit arrivals after each tick, before the running process is requeued or freed
+
+    def __init__(self, time_quantum=None):
+        self.time_quantum = time_quantum
+
+    def add(self, process):
+        """
+        Put a newly admitted process into the ready queue.
+        """
+        raise NotImplementedError
+
+    def pop(self):
+        """
+        Remove and return the process to run next.
+        """
+        raise NotImplementedError
+
+    def requeue(self, process, preempted=False):
+        """
+        Put the running process back after its time slice expired or it was preempted.
+        """
+        self.add(process)
+
+    def complete(self, process):
+        """
+        Called when a process finished, to drop any per-process state.
+        """
+
+    def migrate(self, process, target):
+        """
+        Move the per-process state of a process taken from this queue to another queue of the same policy.
+        """
+
+    def time_slice(self, process):
+        """
+        How long the process may run before the policy decides again.
+        """
+        return process.remaining_time
+
+    def should_preempt(self, process):
+        """
+        Return True if a ready process should take the CPU from the running one.
+        """
+        return False
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+@register_policy
+class FCFSPolicy(SchedulingPolicy):
+    """
+    First-Come-First-Serve: processes run to completion in admission order.
+    """
+    name = "FCFS"
+
+    def __init__(self, time_quantum=None):
+        super().__init__(time_quantum)
+        self.queue = deque()
+
+    def add(self, process):
+        self.queue.append(process)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+@register_policy
+class RoundRobinPolicy(FCFSPolicy):
+    """
+    Round Robin: admission order, each process runs for at most one time quantum at a time.
+    """
+    name = "RR"
+    admit_after_tick = True
+
+    def __init__(self, time_quantum=None):
+        if time_quantum is None:
+            raise ValueError("Round Robin needs a time quantum")
+        if time_quantum < 1:
+            raise ValueError(f"Round Robin needs a positive time quantum, got {time_quantum}")
+        super().__init__(time_quantum)
+
+    def time_slice(self, process):
+        return min(self.time_quantum, process.remaining_time)
+
+
+class HeapPolicy(SchedulingPolicy):
+    """
+    Ready queue kept as a binary heap ordered by key(), ties broken by queueing order.
+    Picking, preempting and requeueing cost O(log n).
+    """
+
+    def __init__(self, time_quantum=None):
+        super().__init__(time_quantum)
+        self.heap = []  # (key, sequence number, process)
+        self.sequence = count()
+
+    def key(self, process):
+        raise NotImplementedError
+
+    def add(self, process):
+        heapq.heappush(self.heap, (self.key(process), next(self.sequence), process))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[-1]
+
+    def should_preempt(self, process):
+        # Only a strictly better process preempts, equal keys keep running
+        return self.preemptive and bool(self.heap) and self.heap[0][0] < self.key(process)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        # In the order the processes would be picked
+        return (entry[-1] for entry in sorted(self.heap, key=lambda entry: entry[:2]))
+
+
+@register_policy
+class SJFPolicy(HeapPolicy):
+    """
+    Shortest Job First: the ready process with the shortest burst runs to completion.
+    """
+    name = "SJF"
+
+    def key(self, process):
+        return process.remaining_time
+
+
+@register_policy
+class SRTFPolicy(SJFPolicy):
+    """
+    Shortest Remaining Time First: preemptive SJF, an arrival with less remaining time takes the CPU.
+    """
+    name = "SRTF"
+    preemptive = True
+
+
+@register_policy
+class PriorityPolicy(HeapPolicy):
+    """
+    Preemptive priority scheduling: lower priority value runs first.
+    """
+    name = "PRIORITY"
+    preemptive = True
+
+    def key(self, process):
+        return process.priority
+
+
+@register_policy
+class MLFQPolicy(HeapPolicy):
+    """
+    Multilevel feedback queue: new processes start in the top level, a process that uses its
+    whole quantum drops one level and lower levels get twice the quantum of the level above.
+    A process arriving in a higher level preempts the running one.
+    """
+    name = "MLFQ"
+    preemptive = True
+    levels = 3
+
+    def __init__(self, time_quantum=None):
+        if time_quantum is None:
+            raise ValueError("MLFQ needs a time quantum for its top level")
+        if time_quantum < 1:
+            raise ValueError(f"MLFQ needs a positive top level time quantum, got {time_quantum}")
+        super().__init__(time_quantum)
+        self.level = {}  # Process id -> current level, 0 is the top
+
+    def key(self, process):
+        return self.level.get(process.process_id, 0)
+
+    def requeue(self, process, preempted=False):
+        if not preempted:
+            # Used up its quantum: demote
+            self.level[process.process_id] = min(self.key(process) + 1, self.levels - 1)
+        self.add(process)
+
+    def complete(self, process):
+        self.level.pop(process.process_id, None)
+
+    def migrate(self, process, target):
+        if process.process_id in self.level:
+            target.level[process.process_id] = self.level.pop(process.process_id)
+
+    def time_slice(self, process):
+        return min(self.time_quantum << self.key(process), process.remaining_time)
@@ -1,14 +1,21 @@
 class Process:
-    def __init__(self, process_id, arrival_time, burst_time, memory_required):
+    # No per-instance __dict__: a million processes take a fraction of the memory
+    __slots__ = ("process_id", "arrival_time", "burst_time", "memory_required", "priority", "remaining_time",
+                 "admission_time", "start_time", "completion_time", "waiting_time", "turnaround_time", "blocked_time")
+
+    def __init__(self, process_id, arrival_time, burst_time, memory_required, priority=0):
         self.process_id = process_id
         self.arrival_time = arrival_time
         self.burst_time = burst_time
         self.memory_required = memory_required
+        self.priority = priority  # Lower value runs first under PRIORITY scheduling
         self.remaining_time = burst_time  # Used for Round Robin
+        self.admission_time = None  # When memory was allocated and the process entered the ready queue
         self.start_time = None
         self.completion_time = None
         self.waiting_time = 0
         self.turnaround_time = 0  # Total time from arrival to completion: completion_time - arrival_time
+        self.blocked_time = 0  # Time spent waiting for memory: admission_time - arrival_time
 
     def __str__(self):
         return f"PID: {self.process_id} required memory: {self.memory_required}"
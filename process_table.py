@@ -0,0 +1,146 @@
+from array import array
+from bisect import bisect_left
+from process import Process
+
+
+FIELDS = Process.__slots__
+OPTIONAL_FIELDS = ("admission_time", "start_time", "completion_time")  # None is stored as MISSING
+MISSING = -1
+
+
+class ProcessTable:
+    """
+    Struct-of-arrays process storage: one array of 64-bit integers per Process field, one row per process.
+    A row costs 8 bytes per field and no Python objects; ProcessView objects are only created for the
+    rows the scheduler is working on. Scheduler.run accepts a table directly and writes results back
+    into its columns (see numpy_column for vectorized analysis).
+    """
+
+    def __init__(self):
+        self.columns = {name: array("q") for name in FIELDS}
+        self.pid_order = None  # Rows sorted by process id, built on first lookup
+
+    @classmethod
+    def from_processes(cls, processes):
+        """
+        Build a table from Process-like objects (their results are copied too).
+        """
+        table = cls()
+        for p in processes:
+            for name in FIELDS:
+                value = getattr(p, name)
+                table.columns[name].append(MISSING if value is None else value)
+        return table
+
+    def append(self, process_id, arrival_time, burst_time, memory_required, priority=0):
+        """
+        Add a process that has not run yet and return its row.
+        """
+        values = Process(process_id, arrival_time, burst_time, memory_required, priority)
+        for name in FIELDS:
+            value = getattr(values, name)
+            self.columns[name].append(MISSING if value is None else value)
+        self.pid_order = None
+        return len(self) - 1
+
+    def copy(self):
+        """
+        Independent copy of the table, e.g. to simulate the same workload twice.
+        """
+        table = ProcessTable()
+        table.columns = {name: array("q", column) for name, column in self.columns.items()}
+        return table
+
+    def numpy_column(self, name):
+        """
+        Zero-copy NumPy view of a column; MISSING marks unset optional values.
+        """
+        import numpy as np
+        return np.frombuffer(self.columns[name], dtype=np.int64)
+
+    def in_arrival_order(self):
+        """
+        Yield a view of every row, ordered by arrival time (ties keep row order).
+        """
+        arrival_time = self.columns["arrival_time"]
+        for row in sorted(range(len(self)), key=arrival_time.__getitem__):
+            yield ProcessView(self, row)
+
+    def by_pid(self, process_id):
+        """
+        View of the row with the given process id.
+        """
+        if self.pid_order is None:
+            self.pid_order = array("q", sorted(range(len(self)), key=self.columns["process_id"].__getitem__))
+        pids = self.columns["process_id"]
+        i = bisect_left(self.pid_order, process_id, key=pids.__getitem__)
+        if i == len(self.pid_order) or pids[self.pid_order[i]] != process_id:
+            raise KeyError(process_id)
+        return ProcessView(self, self.pid_order[i])
+
+    def __len__(self):
+        return len(self.columns["process_id"])
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("process table index out of range")
+        return ProcessView(self, row)
+
+    def __iter__(self):
+        return (ProcessView(self, row) for row in range(len(self)))
+
+
+class ProcessRows:
+    """
+    Lazy sequence of views for the given rows of a table (e.g. a NumPy index array).
+    """
+
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return ProcessView(self.table, int(self.rows[index]))
+
+    def __iter__(self):
+        return (ProcessView(self.table, int(row)) for row in self.rows)
+
+
+class ProcessView:
+    """
+    Process-like access to one row of a ProcessTable; reads and writes go straight to the columns.
+    """
+    __slots__ = ("columns", "row")
+
+    def __init__(self, table, row):
+        self.columns = table.columns
+        self.row = row
+
+    def __str__(self):
+        return f"PID: {self.process_id} required memory: {self.memory_required}"
+
+
+def column_property(name):
+    if name in OPTIONAL_FIELDS:
+        def get(view):
+            value = view.columns[name][view.row]
+            return None if value == MISSING else value
+
+        def set(view, value):
+            view.columns[name][view.row] = MISSING if value is None else value
+    else:
+        def get(view):
+            return view.columns[name][view.row]
+
+        def set(view, value):
+            view.columns[name][view.row] = value
+    return property(get, set)
+
+
+for field in FIELDS:
+    setattr(ProcessView, field, column_property(field))
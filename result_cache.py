@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+
+
+SOURCE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def simulator_version():
+    """
+    Hash of the simulator's source files: any code change gives new cache keys.
+    Computed once per process.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(SOURCE_DIRECTORY)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(SOURCE_DIRECTORY, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of simulation results, one directory per key holding meta.json and result files
+    (trace, charts). Keys hash the workload file contents, the configuration and the simulator
+    version. Entries are written to a temporary directory and renamed into place, so concurrent
+    runs never see half-written entries. Once the cache is over max_bytes the least recently used
+    entries are removed.
+    """
+
+    def __init__(self, directory=".sim_cache", max_bytes=512 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, workload_path, config):
+        """
+        Cache key of running the workload file with the given configuration (a JSON-serializable dict).
+        """
+        digest = hashlib.sha256()
+        with open(workload_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        digest.update(simulator_version().encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        (entry directory, meta) of a cached result, or None. A hit marks the entry as recently used.
+        """
+        entry = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry, "meta.json")) as f:
+                meta = json.load(f)
+            os.utime(entry)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry, meta
+
+    def store(self, key, meta, files):
+        """
+        Cache meta and copies of the given files ({name in the entry: path}, missing paths are skipped).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+        try:
+            for name, path in files.items():
+                if path and os.path.exists(path):
+                    shutil.copyfile(path, os.path.join(staging, name))
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            os.rename(staging, os.path.join(self.directory, key))
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """
+        (last use, size in bytes, path) of every entry.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".staging-") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:
+                continue  # Evicted by another run meanwhile
+        return entries
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits into max_bytes.
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,186 +1,458 @@
 from collections import deque
+from execution_trace import ExecutionTrace, ExecutionLog, NullTrace
+from memory_timeline import NullTimeline
+from policies import create_policy
+from process_table import ProcessTable
+from stats import StatsAccumulator
+
+
+ENGINES = ("tick", "event", "fast")
+ADMISSION_POLICIES = ("backfill", "fifo")
 
 
 class Scheduler:
-    def __init__(self, memory_manager, algorithm="FCFS", time_quantum=None):
+    closed_form_fcfs = True  # Single CPU FCFS can be computed in closed form by the "fast" engine
+
+    def __init__(self, memory_manager, algorithm="FCFS", time_quantum=None, engine="tick", admission="backfill",
+                 keep_completed=True, record_trace=True):
         self.memory_manager = memory_manager
         self.algorithm = algorithm
         self.time_quantum = time_quantum  # Used for Round Robin
-        self.ready_queue = deque()
+        # "tick" advances one time unit per iteration, "event" jumps between events,
+        # "fast" computes FCFS in closed form when memory never blocks (no trace) and otherwise acts like "event"
+        self.engine = engine
+        # "backfill" lets later arrivals skip a process waiting for memory, "fifo" admits strictly in arrival order
+        self.admission = admission
+        self.ready_queue = create_policy(algorithm, time_quantum)  # Ordering of ready processes, see policies.py
         self.time = 0  # The current stimulation time
         self.completed_processes = []
-        self.execution_log = []  # Record process_id per time unit (testing)
+        self.keep_completed = keep_completed  # When False, completions only update stats and are not kept
+        self.stats = StatsAccumulator()  # Updated at every completion, see get_stats
+        # Record execution segments and memory layout changes (visualization, testing). With record_trace=False
+        # neither the trace nor the memory manager's timeline is recorded, so together with keep_completed=False
+        # the memory a run uses does not grow with its length
+        self.record_trace = record_trace
+        self.trace = ExecutionTrace() if record_trace else NullTrace()
+        if not record_trace:
+            timeline = memory_manager.timeline
+            memory_manager.timeline = NullTimeline(memory_manager.iter_blocks(), timeline.keyframe_interval)
         self.current_process = None
         self.time_slice_remaining = 0  # Track one tick per operation for RR
-        self.remaining_processes = []  # Processes that are not yet added to the ready queue
+        self.remaining_processes = deque()  # Processes that have not arrived yet, ordered by arrival time
+        self.arrival_source = None  # Iterator the next arrivals are pulled from lazily, see run(sorted_arrivals=True)
+        self.last_arrival = None
+        self.waiting_processes = deque()  # Arrived processes waiting for memory, in arrival order
+        self.memory_freed = False  # Set by the memory manager, the waiting queue is only retried after a free
+        self.pending_rejections = deque()  # Too big for memory, rejected on the next rejecting admission pass
         self.rejected_processes = []
+        self.closed_form = False  # Set when the run was computed in closed form (no trace recorded)
+        self.event_listeners = []  # Callbacks invoked with every event dict, see events()
+        self.memory_manager.free_listeners.append(self.on_memory_freed)
 
     def add_process(self, process):
         """
         Try to allocate memory and add the process to the ready queue if successful.
         """
         if self.memory_manager.allocate(process):
-            self.ready_queue.append(process)
+            process.admission_time = self.time
+            process.blocked_time = self.time - process.arrival_time
+            self.ready_queue.add(process)
+            if self.event_listeners:
+                self.emit("alloc", process, memory_required=process.memory_required,
+                          blocks=[(block.start, block.size)
+                                  for block in self.memory_manager.blocks_by_pid.get(process.process_id, ())])
+                self.emit("admit", process)
             return True
         return False
 
-    def run(self, processes):
+    def on_memory_freed(self, process):
+        """
+        Called by the memory manager when a process releases its memory, or with None after a compaction.
+        """
+        self.memory_freed = True
+        if process is not None and self.event_listeners:
+            self.emit("free", process, memory_required=process.memory_required)
+
+    def emit(self, event_type, process=None, **fields):
+        """
+        Pass a {"type", "time", "process_id", ...} event to every event listener.
+        """
+        event = {"type": event_type, "time": self.time, "process_id": process.process_id if process else None,
+                 **fields}
+        for listener in self.event_listeners:
+            listener(event)
+
+    def run(self, processes, sorted_arrivals=False):
         """
         Main loop to run the scheduling logic based on the chosen algorithm.
+        With sorted_arrivals the processes must already be in arrival order and are pulled from
+        the iterable only when they are about to arrive, so arbitrarily long streams can be simulated.
+        processes may also be a ProcessTable, whose rows receive the results.
+        """
+        if self.start(processes, sorted_arrivals, closed_form=True):
+            self.run_until()
+
+    def start(self, processes, sorted_arrivals=False, closed_form=False):
+        """
+        Prepare a run on the processes (see run) without simulating anything yet; advance it with
+        step(), run_until() or events(). With closed_form the "fast" engine may compute the whole
+        run right away, in which case False is returned and there is nothing left to step.
         """
-        self.remaining_processes = sorted(processes, key=lambda p: p.arrival_time)
+        self.build_ready_queue()
+        if self.admission not in ADMISSION_POLICIES:
+            raise ValueError(f"Unsupported admission policy: {self.admission}")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unsupported engine: {self.engine}")
+
+        self.closed_form = False
+        if closed_form and self.engine == "fast" and not sorted_arrivals:
+            from fast_path import run_fcfs_closed_form
+            if run_fcfs_closed_form(self, processes):
+                return False
+
+        if isinstance(processes, ProcessTable):
+            processes, sorted_arrivals = processes.in_arrival_order(), True
+
+        if sorted_arrivals:
+            self.remaining_processes = deque()
+            self.arrival_source = iter(processes)
+        else:
+            self.remaining_processes = deque(sorted(processes, key=lambda p: p.arrival_time))
+            self.arrival_source = None
+        self.last_arrival = None
+        self.waiting_processes = deque()
+        self.pending_rejections = deque()
+        self.memory_freed = False
 
         self.current_process = None
         self.time_slice_remaining = 0
+        return True
+
+    def step(self, steps=1):
+        """
+        Advance a started run by up to the given number of steps: ticks with the tick engine,
+        event loop iterations (one arrival, slice end or idle gap each) otherwise.
+        Returns True while the run has work left.
+        """
+        for _ in range(steps):
+            if not self.has_work():
+                break
+            self.advance()
+        return self.has_work()
+
+    def run_until(self, time=None):
+        """
+        Advance a started run until the given simulation time, or to the end without a time.
+        The event engine stops exactly at time; only a compaction stall can carry past it.
+        Returns True while the run has work left.
+        """
+        while self.has_work() and (time is None or self.time < time):
+            self.advance(time)
+        return self.has_work()
 
-        while self.remaining_processes or self.ready_queue or self.current_process:
-            # Add processes to the queue that arrived earlier that the current time
-            arrived_now = [p for p in self.remaining_processes if p.arrival_time <= self.time]
-            for p in arrived_now:
-                if self.add_process(p):
-                    self.remaining_processes.remove(p)
+    def events(self):
+        """
+        Advance a started run step by step, yielding every event as it happens:
+        {"type", "time", "process_id", ...} dicts with type "arrival", "reject", "alloc", "admit",
+        "dispatch", "preempt" (with the reason: "quantum" or "priority"), "complete" or "free".
+        Events are produced one step at a time and only the current step's are buffered. Closing the
+        generator pauses the run (unconsumed events of that step are dropped); it can be continued with
+        step(), run_until() or another events().
+        """
+        buffer = deque()
+        self.event_listeners.append(buffer.append)
+        try:
+            while True:
+                while buffer:
+                    yield buffer.popleft()
+                if not self.has_work():
+                    return
+                self.advance()
+        finally:
+            self.event_listeners.remove(buffer.append)
+
+    def advance(self, horizon=None):
+        """
+        One step of the chosen engine; the event engine does not go past horizon.
+        """
+        if self.engine == "tick":
+            self.tick()
+        else:
+            self.event_step(horizon)
+
+    def build_ready_queue(self):
+        """
+        Create the ready queue for the chosen algorithm, keeping any processes already in it.
+        """
+        # The algorithm and quantum may have been changed after construction
+        ready_queue = create_policy(self.algorithm, self.time_quantum)
+        for p in self.ready_queue:
+            ready_queue.add(p)
+        self.ready_queue = ready_queue
+
+    def admit_arrived(self, reject=True):
+        """
+        Try to admit every process that has arrived by the current time.
+        Processes that can never fit into memory are rejected when reject is True.
+        """
+        if reject:
+            while self.pending_rejections:
+                self.reject(self.pending_rejections.popleft())
+
+        # Allocation can only start succeeding again after some memory was freed,
+        # so the waiting queue is left untouched until then
+        if self.memory_freed:
+            self.memory_freed = False
+            self.retry_waiting()
+
+        # Pop new arrivals off the front of the arrival-ordered queue
+        while self.has_pending_arrival() and self.remaining_processes[0].arrival_time <= self.time:
+            p = self.remaining_processes.popleft()
+            if self.event_listeners:
+                self.emit("arrival", p, memory_required=p.memory_required)
+            if not self.memory_manager.can_fit(p):
+                # If the process is too big for the memory -> reject
+                if reject:
+                    self.reject(p)
                 else:
-                    # If the process is too big for the memory -> reject
-                    if p.memory_required > self.memory_manager.total_memory:
-                        self.rejected_processes.append(p)
-                        self.remaining_processes.remove(p)
+                    self.pending_rejections.append(p)
+            elif (self.admission == "fifo" and self.waiting_processes) or not self.add_process(p):
+                self.waiting_processes.append(p)
 
-            # Algorithm selection
-            if self.algorithm == "FCFS":
-                self.run_fcfs_step()
-            elif self.algorithm == "RR":
-                self.run_round_robin_step()
-            else:
-                raise ValueError(f"Unsupported algorithm: {self.algorithm}")
+        # A compaction during this pass merged the free space, waiting processes may fit now
+        while self.memory_freed:
+            self.memory_freed = False
+            self.retry_waiting()
 
-    def run_fcfs_step(self):
+        # Compacting memory to admit a process stalls the whole system
+        stall = self.memory_manager.take_compaction_time()
+        if stall:
+            self.log_execution(None, self.time, self.time + stall)
+            self.time += stall
+
+    def reject(self, process):
+        self.rejected_processes.append(process)
+        if self.event_listeners:
+            self.emit("reject", process, memory_required=process.memory_required)
+
+    def retry_waiting(self):
         """
-        Executes one simulation tick for FCFS (First-Come-First-Serve) scheduling.
+        Retry allocation for processes waiting for memory, in arrival order.
         """
-        # If there's no currently running process, take the next from the ready queue
+        if self.admission == "fifo":
+            # Head-of-line blocking: stop at the first process that still does not fit
+            while self.waiting_processes and self.add_process(self.waiting_processes[0]):
+                self.waiting_processes.popleft()
+            return
+
+        # Backfilling: any waiting process that fits is admitted, the rest keep their order
+        still_waiting = deque()
+        for p in self.waiting_processes:
+            if not self.add_process(p):
+                still_waiting.append(p)
+        self.waiting_processes = still_waiting
+
+    def has_work(self):
+        """
+        Return True while any process is pending, waiting, ready or running.
+        """
+        return bool(self.has_pending_arrival() or self.waiting_processes or self.pending_rejections
+                    or self.ready_queue or self.current_process)
+
+    def has_pending_arrival(self):
+        """
+        Return True if some process has not arrived yet, pulling the next one from the arrival source if needed.
+        """
+        if not self.remaining_processes and self.arrival_source is not None:
+            p = next(self.arrival_source, None)
+            if p is None:
+                self.arrival_source = None
+                return False
+            if self.last_arrival is not None and p.arrival_time < self.last_arrival:
+                raise ValueError(f"Process {p.process_id} arrives at {p.arrival_time}, "
+                                 f"before the previous arrival at {self.last_arrival}: arrivals are not sorted")
+            self.last_arrival = p.arrival_time
+            self.remaining_processes.append(p)
+        return bool(self.remaining_processes)
+
+    def tick(self):
+        """
+        Tick engine: advances the simulation by exactly one time unit.
+        """
+        # Add processes to the queue that arrived earlier that the current time
+        self.admit_arrived()
+
+        self.run_step()
+
+    def event_step(self, horizon=None):
+        """
+        Event engine: jumps straight to the next arrival, completion, quantum expiry or preemption,
+        but no further than horizon. Produces the same schedule, memory placement and log as the tick engine.
+        """
+        self.admit_arrived()
+
         if not self.current_process and self.ready_queue:
-            self.current_process = self.ready_queue.popleft()
-            if self.current_process.start_time is None:
-                self.current_process.start_time = self.time  # Record when the process started execution
+            self.dispatch()
 
-        if self.current_process:
-            # Log current execution (visualization, testing)
-            self.execution_log.append({
-                "time": self.time,
-                "process_id": self.current_process.process_id,
-                "memory_state": [
-                    (block.start, block.size, block.is_free, block.process_id)
-                    for block in self.memory_manager.blocks
-                ]
-            })
+        if not self.current_process:
+            # Nothing to run: stay idle until the next arrival
+            next_arrival = self.next_arrival_time()
+            idle_until = self.time + 1 if next_arrival is None else max(next_arrival, self.time + 1)
+            if horizon is not None:
+                idle_until = max(min(idle_until, horizon), self.time + 1)
+            self.log_execution(None, self.time, idle_until)
+            self.time = idle_until
+            return
 
-            # Execute one time unit
-            self.current_process.remaining_time -= 1
-            self.time += 1
+        # Run until the slice ends, stopping at arrivals to admit them (and possibly preempt)
+        while self.time_slice_remaining > 0:
+            stop = self.time + self.time_slice_remaining
+            next_arrival = self.next_arrival_time()
+            if next_arrival is not None:
+                # Arrivals held back by a compaction stall are admitted after the next tick
+                stop = min(stop, max(next_arrival, self.time + 1))
+            if horizon is not None:
+                stop = max(min(stop, horizon), self.time + 1)
+            self.log_execution(self.current_process.process_id, self.time, stop)
+            self.current_process.remaining_time -= stop - self.time
+            self.time_slice_remaining -= stop - self.time
+            self.time = stop
+            if self.time_slice_remaining > 0:
+                if self.ready_queue.admit_after_tick:
+                    # Same passes as a tick: admission after the tick, then at the loop top
+                    self.admit_arrived(reject=False)
+                self.admit_arrived()
+                if self.ready_queue.should_preempt(self.current_process):
+                    self.preempt_current()
+                    self.dispatch()
+                if horizon is not None and self.time >= horizon:
+                    # Paused mid-slice: the next step picks the slice up again at the top
+                    return
 
-            # If the process is finished
-            if self.current_process.remaining_time == 0:
-                self.current_process.completion_time = self.time
-                self.current_process.turnaround_time = self.current_process.completion_time - self.current_process.arrival_time
-                self.current_process.waiting_time = self.current_process.start_time - self.current_process.arrival_time
+        if self.ready_queue.admit_after_tick:
+            # e.g. Round Robin admits arrivals before the finished process frees its memory
+            self.admit_arrived(reject=False)
 
-                # Free memory and mark as completed
-                self.memory_manager.deallocate(self.current_process)
-                self.completed_processes.append(self.current_process)
-                self.current_process = None
-        else:
-            # If there's no process to execute, log idle time
-            self.execution_log.append({
-                "time": self.time,
-                "process_id": None,
-                "memory_state": [
-                    (block.start, block.size, block.is_free, block.process_id)
-                    for block in self.memory_manager.blocks
-                ]
-            })
-            self.time += 1
+        self.end_slice()
+
+    def next_arrival_time(self):
+        """
+        Return the arrival time of the next pending process, or None if nothing is pending.
+        """
+        if self.has_pending_arrival():
+            return self.remaining_processes[0].arrival_time
+        return None
 
-    def run_round_robin_step(self):
+    def dispatch(self):
         """
-        Executes one simulation tick for Round Robin scheduling.
+        Take the next process from the ready queue and give it the CPU.
+        """
+        self.current_process = self.ready_queue.pop()
+        if self.current_process.start_time is None:
+            self.current_process.start_time = self.time  # Record when the process started execution
+        self.time_slice_remaining = self.ready_queue.time_slice(self.current_process)
+        if self.event_listeners:
+            self.emit("dispatch", self.current_process)
+
+    def preempt_current(self):
+        """
+        Put the running process back into the ready queue before its slice ended.
+        """
+        if self.event_listeners:
+            self.emit("preempt", self.current_process, reason="priority")
+        self.ready_queue.requeue(self.current_process, preempted=True)
+        self.current_process = None
+
+    def end_slice(self):
         """
+        Complete the running process if it is finished, otherwise requeue it once its slice expired.
+        """
+        if self.current_process.remaining_time == 0:
+            self.complete_current()
+        elif self.time_slice_remaining == 0:
+            if self.event_listeners:
+                self.emit("preempt", self.current_process, reason="quantum")
+            self.ready_queue.requeue(self.current_process)
+            self.current_process = None
+
+    def complete_current(self):
+        """
+        Record completion of the running process, free its memory and mark it as completed.
+        """
+        self.complete_process(self.current_process, self.ready_queue)
+        self.current_process = None
+
+    def complete_process(self, process, ready_queue):
+        """
+        Record completion of a process that ran from ready_queue and free its memory.
+        """
+        process.completion_time = self.time
+        process.turnaround_time = process.completion_time - process.arrival_time
+        process.waiting_time = process.start_time - process.arrival_time
+
+        if self.event_listeners:
+            self.emit("complete", process)
+        ready_queue.complete(process)
+        self.memory_manager.deallocate(process)
+        self.stats.add(process)
+        if self.keep_completed:
+            self.completed_processes.append(process)
+
+    def log_execution(self, process_id, start, end):
+        """
+        Log which process (None for idle) ran in [start, end).
+        """
+        self.trace.record(process_id, start, end, self.memory_manager)
+
+    @property
+    def execution_log(self):
+        """
+        Per time unit view of the trace: one {"time", "process_id", "memory_state"} dict per tick.
+        """
+        return ExecutionLog(self.trace)
+
+    def run_step(self):
+        """
+        Executes one simulation tick for the chosen scheduling policy.
+        """
+        # A better process admitted at this tick takes the CPU (preemptive policies only)
+        if self.current_process and self.ready_queue.should_preempt(self.current_process):
+            self.preempt_current()
+
         # If there's no currently running process, take the next from the ready queue
         if not self.current_process and self.ready_queue:
-            self.current_process = self.ready_queue.popleft()
-            if self.current_process.start_time is None:
-                self.current_process.start_time = self.time  # Mark the start of execution
-            self.time_slice_remaining = min(self.time_quantum, self.current_process.remaining_time)
+            self.dispatch()
 
         if self.current_process:
             # Log current execution (visualization, testing)
-            self.execution_log.append({
-                "time": self.time,
-                "process_id": self.current_process.process_id,
-                "memory_state": [
-                    (block.start, block.size, block.is_free, block.process_id)
-                    for block in self.memory_manager.blocks
-                ]
-            })
+            self.log_execution(self.current_process.process_id, self.time, self.time + 1)
 
             # Execute one time unit
             self.current_process.remaining_time -= 1
             self.time_slice_remaining -= 1
             self.time += 1
 
-            # Check if new processes have arrived after this tick
-            arrived_now = [p for p in self.remaining_processes if p.arrival_time <= self.time]
-            for p in arrived_now:
-                if self.add_process(p):
-                    self.remaining_processes.remove(p)
-
-            # Process finished execution
-            if self.current_process.remaining_time == 0:
-                self.current_process.completion_time = self.time
-                self.current_process.turnaround_time = self.current_process.completion_time - self.current_process.arrival_time
-                self.current_process.waiting_time = self.current_process.start_time - self.current_process.arrival_time
-
-                self.memory_manager.deallocate(self.current_process)
-                self.completed_processes.append(self.current_process)
-                self.current_process = None
-
-            # Time slice expired but process not finished — put it back to the queue
-            elif self.time_slice_remaining == 0:
-                self.ready_queue.append(self.current_process)
-                self.current_process = None
+            if self.ready_queue.admit_after_tick:
+                # Check if new processes have arrived after this tick
+                self.admit_arrived(reject=False)
+
+            # Finished, or time slice expired but process not finished — put it back to the queue
+            self.end_slice()
         else:
             # If there's no process to execute, log idle time
-            self.execution_log.append({
-                "time": self.time,
-                "process_id": None,
-                "memory_state": [
-                    (block.start, block.size, block.is_free, block.process_id)
-                    for block in self.memory_manager.blocks
-                ]
-            })
+            self.log_execution(None, self.time, self.time + 1)
             self.time += 1
 
     def get_stats(self):
         """
-        Return summary statistics for all completed processes.
+        Return summary statistics for all completed processes: means and p50/p95/p99 tails of
+        the per process times, throughput and CPU utilization (see stats.StatsAccumulator).
         """
-        if not self.completed_processes:
-            return {}
-
-        return {
-            "avg_waiting_time": sum(p.waiting_time for p in self.completed_processes) / len(self.completed_processes),
-            "avg_turnaround_time": sum(p.turnaround_time for p in self.completed_processes) / len(
-                self.completed_processes),
-        }
+        return self.stats.get_stats(self.time)
 
     def get_rejected_processes(self):
         """
-        Return rejected processes.
+        Return one record per rejected process, in the order they were rejected.
         """
-        if not self.rejected_processes:
-            return ""
-
-        rejected_processes_str = ""
-        for p in self.rejected_processes:
-            rejected_processes_str += str(p) + ', '
-        return rejected_processes_str
-
+        return [{"process_id": p.process_id, "arrival_time": p.arrival_time, "memory_required": p.memory_required}
+                for p in self.rejected_processes]
@@ -0,0 +1,104 @@
+class Slab:
+    """
+    A region of memory carved into equally sized slots of one size class.
+    """
+
+    def __init__(self, size_class, slots):
+        self.size_class = size_class
+        self.slots = slots  # Slot blocks in address order
+        self.free = list(reversed(slots))  # Stack of free slot blocks, lowest address on top
+        self.used = 0
+        self.partial = False  # Whether the slab is on its size class's partial stack
+        self.released = False
+
+
+class SizeClass:
+    """
+    Slabs serving one slot size, with a stack of slabs that still have free slots.
+    """
+
+    def __init__(self, size, slots_per_slab):
+        self.size = size
+        self.slots_per_slab = slots_per_slab
+        self.slabs = set()
+        self.partial = []  # Slabs with free slots; full or released ones are dropped lazily
+        self.empty_slab = None  # One fully free slab is kept around to avoid carving it again
+
+        self.used_slots = 0
+        self.total_slots = 0
+        self.requested = 0  # Sum of what the processes in used slots asked for
+        self.peak_used = 0
+        self.allocations = 0
+        self.total_waste = 0  # Slot size minus requested size, summed over all allocations
+
+    def clear(self):
+        """
+        Forget all slabs, used when the memory layout is replaced wholesale.
+        """
+        self.slabs = set()
+        self.partial = []
+        self.empty_slab = None
+        self.used_slots = self.total_slots = self.requested = 0
+
+    def take_slot(self):
+        """
+        Return a free slot from a partial slab in O(1), or None if every slab is full.
+        """
+        while self.partial:
+            slab = self.partial[-1]
+            if slab.free and not slab.released:
+                if slab is self.empty_slab:
+                    self.empty_slab = None
+                slot = slab.free.pop()
+                slab.used += 1
+                self.used_slots += 1
+                self.peak_used = max(self.peak_used, self.used_slots)
+                return slot
+            self.partial.pop()
+            slab.partial = False
+        return None
+
+    def return_slot(self, slot):
+        """
+        Put a slot back on its slab's free list.
+        Returns a slab that became empty and should be released, if any.
+        """
+        slab = slot.slab
+        slab.free.append(slot)
+        slab.used -= 1
+        self.used_slots -= 1
+        if not slab.partial:
+            slab.partial = True
+            self.partial.append(slab)
+
+        if slab.used == 0:
+            if self.empty_slab is None:
+                self.empty_slab = slab
+            elif self.empty_slab is not slab:
+                return slab
+        return None
+
+    def add_slab(self, slab):
+        self.slabs.add(slab)
+        self.total_slots += len(slab.slots)
+        slab.partial = True
+        self.partial.append(slab)
+
+    def remove_slab(self, slab):
+        slab.released = True
+        self.slabs.remove(slab)
+        self.total_slots -= len(slab.slots)
+        if self.empty_slab is slab:
+            self.empty_slab = None
+
+    def get_stats(self):
+        return {
+            "slabs": len(self.slabs),
+            "slots": self.total_slots,
+            "used": self.used_slots,
+            "occupancy": self.used_slots / self.total_slots if self.total_slots else 0.0,
+            # Free slots plus the unused tail of every used slot
+            "waste": self.total_slots * self.size - self.requested,
+            "peak_used": self.peak_used,
+            "avg_waste_per_allocation": self.total_waste / self.allocations if self.allocations else 0.0,
+        }
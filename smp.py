@@ -0,0 +1,242 @@
+from itertools import chain
+from execution_trace import ExecutionTrace, ExecutionLog, NullTrace
+from policies import create_policy
+from scheduler import Scheduler
+
+
+BALANCING = ("global", "steal")
+
+
+class Core:
+    """
+    One CPU: the process running on it, the ready queue it takes work from and its own trace.
+    """
+
+    def __init__(self, index, ready_queue, record_trace=True):
+        self.index = index
+        self.ready_queue = ready_queue  # Shared by all cores under global balancing
+        self.current_process = None
+        self.time_slice_remaining = 0
+        self.trace = ExecutionTrace() if record_trace else NullTrace()
+        self.busy_time = 0
+        self.migrations = 0  # Dispatches of a process that last ran on another core
+        self.steals = 0  # Processes taken from another core's ready queue
+
+    def load(self):
+        return len(self.ready_queue) + (self.current_process is not None)
+
+    def get_stats(self, time):
+        return {
+            "core": self.index,
+            "busy_time": self.busy_time,
+            "utilization": self.busy_time / time if time else 0.0,
+            "migrations": self.migrations,
+            "steals": self.steals,
+        }
+
+
+class PerCoreQueues:
+    """
+    The ready queues of all cores seen as one: an admitted process joins the least loaded core.
+    """
+
+    def __init__(self, cores):
+        self.cores = cores
+        self.preemptive = cores[0].ready_queue.preemptive
+        self.admit_after_tick = cores[0].ready_queue.admit_after_tick
+
+    def add(self, process):
+        # min() keeps the lowest core index on ties
+        min(self.cores, key=Core.load).ready_queue.add(process)
+
+    def __len__(self):
+        return sum(len(core.ready_queue) for core in self.cores)
+
+    def __iter__(self):
+        return chain.from_iterable(core.ready_queue for core in self.cores)
+
+
+class SMPScheduler(Scheduler):
+    """
+    Scheduler for several CPUs sharing one memory manager.
+    With "global" balancing every core takes work from one shared ready queue. With "steal"
+    every core has its own ready queue, admitted processes join the least loaded core and a
+    core with nothing to run takes the next process from the core with the longest queue.
+    Each core keeps its own trace; trace (and execution_log) is core 0's, whose memory
+    snapshots cover the whole run.
+    """
+
+    closed_form_fcfs = False
+
+    def __init__(self, memory_manager, algorithm="FCFS", time_quantum=None, engine="tick", admission="backfill",
+                 keep_completed=True, record_trace=True, cpus=2, balancing="steal"):
+        super().__init__(memory_manager, algorithm=algorithm, time_quantum=time_quantum, engine=engine,
+                         admission=admission, keep_completed=keep_completed, record_trace=record_trace)
+        self.cpus = cpus
+        self.balancing = balancing
+        self.cores = []
+        self.last_core = {}  # Process id -> index of the core it last ran on
+
+    def build_ready_queue(self):
+        if self.cpus < 1:
+            raise ValueError(f"Need at least one CPU, got {self.cpus}")
+        if self.balancing not in BALANCING:
+            raise ValueError(f"Unsupported balancing: {self.balancing}")
+
+        pending = list(self.ready_queue)
+        if self.balancing == "global":
+            shared = create_policy(self.algorithm, self.time_quantum)
+            self.cores = [Core(index, shared, self.record_trace) for index in range(self.cpus)]
+            self.ready_queue = shared
+        else:
+            self.cores = [Core(index, create_policy(self.algorithm, self.time_quantum), self.record_trace)
+                          for index in range(self.cpus)]
+            self.ready_queue = PerCoreQueues(self.cores)
+        for p in pending:
+            self.ready_queue.add(p)
+        self.trace = self.cores[0].trace
+        self.last_core = {}
+
+    def has_work(self):
+        return super().has_work() or any(core.current_process for core in self.cores)
+
+    def tick(self):
+        """
+        Tick engine: every core advances by exactly one time unit.
+        """
+        self.admit_arrived()
+        self.schedule_cores()
+        self.run_cores(self.time + 1)
+
+    def event_step(self, horizon=None):
+        """
+        Event engine: jumps to the next arrival or the earliest slice end on any core, but no further
+        than horizon. Produces the same schedule as the tick engine.
+        """
+        self.admit_arrived()
+        self.schedule_cores()
+
+        stop = None
+        for core in self.cores:
+            if core.current_process and (stop is None or core.time_slice_remaining < stop):
+                stop = core.time_slice_remaining
+        next_arrival = self.next_arrival_time()
+        if stop is None:
+            # Every core is idle: stay idle until the next arrival
+            stop = self.time + 1 if next_arrival is None else max(next_arrival, self.time + 1)
+        else:
+            stop += self.time
+            if next_arrival is not None:
+                stop = min(stop, max(next_arrival, self.time + 1))
+        if horizon is not None:
+            stop = max(min(stop, horizon), self.time + 1)
+        self.run_cores(stop)
+
+    def schedule_cores(self):
+        """
+        Let every core, in index order, preempt its process or pick up work if it is idle.
+        """
+        for core in self.cores:
+            ready_queue = core.ready_queue
+            if core.current_process and ready_queue.should_preempt(core.current_process):
+                if self.event_listeners:
+                    self.emit("preempt", core.current_process, reason="priority", core=core.index)
+                ready_queue.requeue(core.current_process, preempted=True)
+                core.current_process = None
+
+            if core.current_process:
+                continue
+            if ready_queue:
+                self.dispatch_on(core, ready_queue.pop())
+            elif self.balancing == "steal":
+                # max() keeps the lowest core index on ties
+                victim = max(self.cores, key=lambda other: len(other.ready_queue))
+                if victim.ready_queue:
+                    process = victim.ready_queue.pop()
+                    victim.ready_queue.migrate(process, ready_queue)
+                    core.steals += 1
+                    self.dispatch_on(core, process)
+
+    def dispatch_on(self, core, process):
+        """
+        Give the core's CPU to the process.
+        """
+        core.current_process = process
+        if process.start_time is None:
+            process.start_time = self.time
+        core.time_slice_remaining = core.ready_queue.time_slice(process)
+        if self.event_listeners:
+            self.emit("dispatch", process, core=core.index)
+
+        last_core = self.last_core.get(process.process_id)
+        if last_core is not None and last_core != core.index:
+            core.migrations += 1
+        self.last_core[process.process_id] = core.index
+
+    def complete_process(self, process, ready_queue):
+        self.last_core.pop(process.process_id, None)  # Keeps the map to the processes still running
+        super().complete_process(process, ready_queue)
+
+    def run_cores(self, end):
+        """
+        Run every core from the current time to end, then complete or requeue expired slices.
+        """
+        duration = end - self.time
+        running = False
+        for core in self.cores:
+            process = core.current_process
+            self.log_execution(process.process_id if process else None, self.time, end, (core,))
+            if process:
+                running = True
+                process.remaining_time -= duration
+                core.time_slice_remaining -= duration
+                core.busy_time += duration
+        self.time = end
+
+        if not running:
+            return
+        if self.ready_queue.admit_after_tick:
+            # e.g. Round Robin admits arrivals before the finished processes free their memory
+            self.admit_arrived(reject=False)
+
+        for core in self.cores:
+            process = core.current_process
+            if process and core.time_slice_remaining == 0:
+                core.current_process = None
+                if process.remaining_time == 0:
+                    self.complete_process(process, core.ready_queue)
+                else:
+                    if self.event_listeners:
+                        self.emit("preempt", process, reason="quantum", core=core.index)
+                    core.ready_queue.requeue(process)
+
+    def log_execution(self, process_id, start, end, cores=None):
+        """
+        Log which process (None for idle) ran in [start, end) on the given cores. Without cores it
+        is a system-wide stall (e.g. compaction) logged on every core.
+        """
+        for core in self.cores if cores is None else cores:
+            core.trace.record(process_id, start, end, self.memory_manager)
+
+    @property
+    def core_logs(self):
+        """
+        Per time unit view of every core's trace.
+        """
+        return [ExecutionLog(core.trace) for core in self.cores]
+
+    def core_stats(self):
+        """
+        Utilization, migrations and steals of every core.
+        """
+        return [core.get_stats(self.time) for core in self.cores]
+
+    def get_stats(self):
+        # Utilization is averaged over all cores, followed by each core's own
+        stats = self.stats.get_stats(self.time, cpus=self.cpus)
+        if stats:
+            stats["migrations"] = sum(core.migrations for core in self.cores)
+            for core in self.core_stats():
+                stats[f"core{core['core']}_utilization"] = core["utilization"]
+                stats[f"core{core['core']}_migrations"] = core["migrations"]
+        return stats
@@ -0,0 +1,187 @@
+import math
+
+
+PERCENTILES = (50, 95, 99)
+
+
+class RunningMoments:
+    """
+    Count, sum, sum of squares, minimum and maximum of a stream of values.
+    Sums of integers are kept as exact Python ints, so the mean does not depend on the order
+    values were added or merged in.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value, count=1):
+        self.count += count
+        self.total += value * count
+        self.total_squares += value * value * count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None or other.maximum > self.maximum):
+            self.maximum = other.maximum
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def variance(self):
+        if not self.count:
+            return None
+        return max(self.total_squares / self.count - self.mean ** 2, 0.0)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for non-negative values with bounded relative error.
+    Positive values are counted in logarithmic buckets ((gamma^(k-1), gamma^k] for bucket k), zeros
+    separately, so any quantile is returned within relative_accuracy of a value at that rank while
+    memory only grows with the logarithm of the value range, not with the number of values.
+    Two sketches with the same accuracy merge by adding their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Relative accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # Bucket index -> count
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        if value < 0:
+            raise ValueError(f"Quantile sketch values must not be negative, got {value}")
+        self.count += count
+        if value == 0:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q):
+        """
+        Approximate value at quantile q (0 <= q <= 1), or None if nothing was added.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        if not self.count:
+            return None
+
+        rank = max(math.ceil(q * self.count) - 1, 0)  # Nearest rank, as an index into the sorted values
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+
+
+class StatsAccumulator:
+    """
+    Statistics of completed processes, updated one completion at a time so that no process
+    has to be kept around. Accumulators of separate runs (e.g. parallel workers) can be merged.
+
+    Per process metrics:
+        waiting_time    - arrival to first run (as Process.waiting_time)
+        turnaround_time - arrival to completion
+        response_time   - admission into the ready queue to first run, i.e. waiting without the time blocked on memory
+        blocked_time    - arrival to admission
+    """
+
+    METRICS = ("waiting_time", "turnaround_time", "response_time", "blocked_time")
+    TAIL_METRICS = ("waiting_time", "turnaround_time", "response_time")
+
+    def __init__(self, relative_accuracy=0.01):
+        self.moments = {metric: RunningMoments() for metric in self.METRICS}
+        self.sketches = {metric: QuantileSketch(relative_accuracy) for metric in self.TAIL_METRICS}
+        self.completed = 0
+        self.busy_time = 0  # CPU time used by the completed processes
+
+    def add(self, process):
+        """
+        Record one completed process.
+        """
+        self.record({
+            "waiting_time": process.waiting_time,
+            "turnaround_time": process.turnaround_time,
+            "response_time": process.start_time - process.admission_time,
+            "blocked_time": process.blocked_time,
+        }, process.burst_time)
+
+    def add_many(self, metrics, burst_time):
+        """
+        Record many completed processes at once from NumPy arrays: metrics maps every name in
+        METRICS to an integer array. Gives exactly the same result as adding them one by one.
+        """
+        import numpy as np
+        for metric in self.METRICS:
+            values, counts = np.unique(metrics[metric], return_counts=True)
+            for value, count in zip(values.tolist(), counts.tolist()):
+                self.moments[metric].add(value, count)
+                if metric in self.sketches:
+                    self.sketches[metric].add(value, count)
+        self.completed += len(burst_time)
+        self.busy_time += int(burst_time.sum())
+
+    def record(self, values, burst_time):
+        for metric, value in values.items():
+            self.moments[metric].add(value)
+            if metric in self.sketches:
+                self.sketches[metric].add(value)
+        self.completed += 1
+        self.busy_time += burst_time
+
+    def merge(self, other):
+        """
+        Add the completions recorded by another accumulator to this one.
+        """
+        for metric in self.METRICS:
+            self.moments[metric].merge(other.moments[metric])
+        for metric in self.TAIL_METRICS:
+            self.sketches[metric].merge(other.sketches[metric])
+        self.completed += other.completed
+        self.busy_time += other.busy_time
+
+    def get_stats(self, time, cpus=1):
+        """
+        Summary of a run that lasted time units on cpus CPUs; empty if nothing completed.
+        """
+        if not self.completed:
+            return {}
+
+        stats = {f"avg_{metric}": self.moments[metric].mean
+                 for metric in ("waiting_time", "turnaround_time", "blocked_time", "response_time")}
+        for metric in self.TAIL_METRICS:
+            for percentile in PERCENTILES:
+                stats[f"p{percentile}_{metric}"] = self.sketches[metric].quantile(percentile / 100)
+        stats["throughput"] = self.completed / time if time else 0.0
+        stats["cpu_utilization"] = self.busy_time / (time * cpus) if time else 0.0
+        return stats
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from scheduler import Scheduler
+from memory_manager import MemoryManager, STRATEGIES
+from policies import POLICIES
+from process import Process
+
+
+# Workload of the current sweep as (process_id, arrival_time, burst_time, memory_required, priority) tuples.
+# Set in the parent before the pool starts, so forked workers share it copy-on-write instead of each
+# re-reading the input file.
+WORKLOAD = ()
+SIZE_CLASSES = ()
+
+
+def init_worker(workload, size_classes):
+    """
+    Make the workload available in a worker (only needed when workers are spawned rather than forked).
+    """
+    global WORKLOAD, SIZE_CLASSES
+    WORKLOAD = workload
+    SIZE_CLASSES = size_classes
+
+
+def build_grid(schedulers, quanta, memories, strategies):
+    """
+    All (scheduler, quantum, memory, strategy) combinations, in a stable order.
+    """
+    return list(product(schedulers, quanta, memories, strategies))
+
+
+def run_configuration(configuration):
+    """
+    Simulate the shared workload with one configuration and return a result row.
+    """
+    algorithm, quantum, memory, strategy = configuration
+    processes = [Process(*p) for p in WORKLOAD]
+    memory_manager = MemoryManager(total_memory=memory, strategy=strategy, size_classes=SIZE_CLASSES)
+    scheduler = Scheduler(memory_manager, algorithm=algorithm, time_quantum=quantum, engine="event",
+                          keep_completed=False, record_trace=False)
+    scheduler.run(processes)
+
+    return {
+        "scheduler": algorithm,
+        "quantum": quantum,
+        "memory": memory,
+        "strategy": strategy,
+        **scheduler.get_stats(),
+        "completed": scheduler.stats.completed,
+        "rejected": len(scheduler.rejected_processes),
+        "makespan": scheduler.time,
+    }
+
+
+def run_sweep(processes, grid, workers=None, size_classes=()):
+    """
+    Run every configuration of the grid on the processes, one configuration per pool task.
+    Returns the result rows in grid order.
+    """
+    global WORKLOAD, SIZE_CLASSES
+    WORKLOAD = tuple((p.process_id, p.arrival_time, p.burst_time, p.memory_required, p.priority)
+                     for p in processes)
+    SIZE_CLASSES = tuple(size_classes)
+
+    workers = min(workers or os.cpu_count() or 1, len(grid)) or 1
+    if workers == 1:
+        return [run_configuration(configuration) for configuration in grid]
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Forked workers inherit WORKLOAD, nothing is pickled per worker
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(WORKLOAD, SIZE_CLASSES))
+    with executor:
+        return list(executor.map(run_configuration, grid))
+
+
+def format_table(rows):
+    """
+    Render result rows as an aligned text table.
+    """
+    if not rows:
+        return ""
+
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    cells = [[format_cell(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths)),
+             "  ".join("-" * width for width in widths)]
+    lines += ["  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells]
+    return "\n".join(lines)
+
+
+def format_cell(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def positive_int(value):
+    """
+    argparse type for counts and durations that must be at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def comma_separated(convert):
+    return lambda value: [convert(item) for item in value.split(",")]
+
+
+def run_sweep_cli():
+    # Imported here because cli imports format_table from this module
+    from cli import load_processes_from_file, common_sizes
+
+    parser = argparse.ArgumentParser(description="OS Scheduler Simulator parameter sweep")
+    parser.add_argument("--file", required=True, help="Path to JSON file with processes")
+    parser.add_argument("--scheduler", type=comma_separated(str), default=["FCFS", "RR"],
+                        help=f"Comma separated scheduling algorithms ({', '.join(POLICIES)})")
+    parser.add_argument("--quantum", type=comma_separated(positive_int), default=[4],
+                        help="Comma separated time quanta")
+    parser.add_argument("--memory", type=comma_separated(int), default=[1024],
+                        help="Comma separated total memory sizes")
+    parser.add_argument("--strategy", type=comma_separated(str), default=["first_fit", "best_fit"],
+                        help=f"Comma separated memory allocation strategies ({', '.join(STRATEGIES)})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--csv", help="Also write the results to this CSV file")
+
+    args = parser.parse_args()
+    for algorithm in args.scheduler:
+        if algorithm not in POLICIES:
+            parser.error(f"unknown scheduler {algorithm!r}")
+    for strategy in args.strategy:
+        if strategy not in STRATEGIES:
+            parser.error(f"unknown strategy {strategy!r}")
+
+    processes = load_processes_from_file(args.file)
+    if not processes:
+        sys.exit(1)
+
+    grid = build_grid(args.scheduler, args.quantum, args.memory, args.strategy)
+    rows = run_sweep(processes, grid, workers=args.workers, size_classes=common_sizes(processes))
+    print(format_table(rows))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(dict.fromkeys(key for row in rows for key in row)))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    run_sweep_cli()
@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import csv
+import json
+import pytest
+from cli import build_parser, output_directories, run_batch, workload_files
+
+
+PROCESSES = [
+    {"process_id": 1, "arrival_time": 0, "burst_time": 5, "memory_required": 600},
+    {"process_id": 2, "arrival_time": 1, "burst_time": 3, "memory_required": 300},
+    {"process_id": 3, "arrival_time": 2, "burst_time": 4, "memory_required": 5000},
+]
+
+
+def write_workloads(directory):
+    directory.mkdir()
+    with open(directory / "small.json", "w") as f:
+        json.dump({"processes": PROCESSES}, f)
+    with open(directory / "small.jsonl", "w") as f:
+        f.writelines(json.dumps(p) + "\n" for p in PROCESSES[:2])
+    (directory / "broken.json").write_text("{")
+    (directory / "notes.txt").write_text("not a workload")
+
+
+def test_workload_files_and_output_directories(tmp_path):
+    write_workloads(tmp_path / "in")
+    files = workload_files(str(tmp_path / "in"))
+
+    assert [os.path.basename(path) for path in files] == ["broken.json", "small.json", "small.jsonl"]
+    assert workload_files(str(tmp_path / "in" / "*.jsonl")) == files[2:]
+    assert output_directories(files, "out") == [os.path.join("out", "broken"), os.path.join("out", "small"),
+                                                os.path.join("out", "small-2")]
+
+
+def test_batch_writes_outputs_and_summary(tmp_path):
+    write_workloads(tmp_path / "in")
+    output_dir = tmp_path / "out"
+    args = build_parser().parse_args(["--batch", str(tmp_path / "in"), "--output-dir", str(output_dir),
+                                      "--scheduler", "RR", "--no-cache", "--trace-out", "run.npz"])
+    rows = run_batch(args, workload_files(args.batch))
+
+    broken, small, small_lines = rows
+    assert "error" in broken
+    assert (small["completed"], small["rejected"], small["makespan"]) == (2, 1, 8)
+    assert small["rejected_processes"] == [{"process_id": 3, "arrival_time": 2, "memory_required": 5000}]
+    assert (small_lines["completed"], small_lines["rejected"]) == (2, 0)
+    for name in ("small", "small-2"):
+        assert sorted(os.listdir(output_dir / name)) == ["memory.png", "processes.png", "run.npz"]
+
+    with open(output_dir / "summary.json") as f:
+        summary = json.load(f)
+    assert summary["workloads"] == rows
+    assert summary["totals"] == {"workloads": 3, "failed": 1, "completed": 4, "rejected": 1}
+    with open(output_dir / "summary.csv") as f:
+        assert [row["rejected_processes"] for row in csv.DictReader(f)] == ["", "3", ""]
+
+
+def test_cli_rejects_compaction_without_a_compacting_strategy(tmp_path, monkeypatch, capsys):
+    from cli import run_simulation
+
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--batch", str(tmp_path), "--strategy", "buddy",
+                                      "--compaction-threshold", "0.5"])
+    with pytest.raises(SystemExit):
+        run_simulation()
+    assert "--compaction-threshold is not supported with --strategy buddy" in capsys.readouterr().err
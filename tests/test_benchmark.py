@@ -0,0 +1,23 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from benchmark import benchmark_scheduler, benchmark_memory
+
+
+@pytest.mark.parametrize("strategy", ["first_fit", "slab"])
+def test_scheduler_benchmark_row(strategy):
+    row = benchmark_scheduler(300, "RR", strategy, memory=8192, quantum=4, seed=0, arrival="bursty")
+
+    assert row["processes"] == 300
+    assert row["simulated_ticks"] > 0
+    assert row["ticks_per_sec"] > 0 and row["events_per_sec"] > 0
+
+
+def test_memory_benchmark_row():
+    row = benchmark_memory(300, "best_fit", memory=4096, seed=0)
+
+    assert row["failed"] == 0
+    assert row["alloc_p50_ns"] <= row["alloc_p99_ns"]
+    assert row["allocations_per_sec"] > 0
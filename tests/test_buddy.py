@@ -0,0 +1,65 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from buddy import BuddyAllocator
+from memory_manager import MemoryManager
+from process import Process
+
+
+@pytest.fixture
+def memory_manager():
+    return MemoryManager(total_memory=1024, strategy="buddy")
+
+
+def layout(memory_manager):
+    return [(block.start, block.size, block.is_free) for block in memory_manager.blocks]
+
+
+def test_regions_for_non_power_of_two_memory():
+    allocator = BuddyAllocator(1000, min_block_size=8)
+
+    assert allocator.regions == [(0, 9), (512, 8), (768, 7), (896, 6), (960, 5), (992, 3)]
+    assert allocator.buddy_of(0, 9) is None, "A whole region has no buddy"
+    assert allocator.buddy_of(512, 7) == 640
+
+
+def test_buddy_allocation_rounds_up_and_splits(memory_manager):
+    process = Process(process_id=1, arrival_time=0, burst_time=5, memory_required=150)
+
+    assert memory_manager.allocate(process) is True
+    assert layout(memory_manager) == [(0, 256, False), (256, 256, True), (512, 512, True)]
+    assert memory_manager.get_stats()["peak_internal_fragmentation"] == 106
+
+
+def test_buddy_free_merges_back(memory_manager):
+    processes = [Process(pid, 0, 5, size) for pid, size in [(1, 150), (2, 100), (3, 300)]]
+    for process in processes:
+        assert memory_manager.allocate(process) is True
+    assert layout(memory_manager) == [(0, 256, False), (256, 128, False), (384, 128, True), (512, 512, False)]
+
+    memory_manager.deallocate(processes[1])
+    assert layout(memory_manager) == [(0, 256, False), (256, 256, True), (512, 512, False)]
+
+    memory_manager.deallocate(processes[0])
+    memory_manager.deallocate(processes[2])
+    assert layout(memory_manager) == [(0, 1024, True)]
+
+
+def test_buddy_can_fit_checks_largest_region():
+    memory_manager = MemoryManager(total_memory=1000, strategy="buddy")
+
+    assert memory_manager.can_fit(Process(1, 0, 5, 512)) is True
+    assert memory_manager.can_fit(Process(2, 0, 5, 600)) is False, "600 rounds up to 1024 > largest region"
+
+
+def test_scheduler_rejects_process_buddy_can_never_place():
+    from scheduler import Scheduler
+
+    scheduler = Scheduler(MemoryManager(total_memory=1000, strategy="buddy"))
+    process = Process(1, 0, 5, 600)
+
+    scheduler.run([process])
+
+    assert scheduler.rejected_processes == [process]
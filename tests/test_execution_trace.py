@@ -0,0 +1,53 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from execution_trace import ExecutionTrace, ExecutionLog
+from memory_manager import MemoryManager
+from process import Process
+
+
+def test_record_merges_consecutive_segments():
+    trace = ExecutionTrace()
+    memory_manager = MemoryManager(total_memory=1024)
+
+    trace.record(1, 0, 1, memory_manager)
+    trace.record(1, 1, 4, memory_manager)
+    trace.record(None, 4, 6, memory_manager)
+    trace.record(1, 6, 7, memory_manager)
+
+    assert trace.segments == [(1, 0, 4), (None, 4, 6), (1, 6, 7)]
+    assert len(trace) == 7
+
+
+def test_memory_snapshot_taken_only_on_layout_change():
+    trace = ExecutionTrace()
+    memory_manager = MemoryManager(total_memory=1024)
+    process = Process(process_id=1, arrival_time=0, burst_time=5, memory_required=150)
+
+    trace.record(None, 0, 2, memory_manager)
+    memory_manager.allocate(process)
+    trace.record(1, 2, 5, memory_manager)
+    trace.record(1, 5, 7, memory_manager)
+    memory_manager.deallocate(process)
+    trace.record(None, 7, 8, memory_manager)
+
+    assert [time for time, _ in trace.memory_changes] == [0, 2, 7]
+    assert trace.memory_state_at(6) == ((0, 150, False, 1), (150, 874, True, None))
+
+
+def test_execution_log_expands_to_ticks():
+    trace = ExecutionTrace()
+    memory_manager = MemoryManager(total_memory=1024)
+    process = Process(process_id=1, arrival_time=0, burst_time=2, memory_required=150)
+
+    trace.record(None, 0, 1, memory_manager)
+    memory_manager.allocate(process)
+    trace.record(1, 1, 3, memory_manager)
+
+    log = ExecutionLog(trace)
+
+    assert len(log) == 3
+    assert [entry["process_id"] for entry in log] == [None, 1, 1]
+    assert list(log)[0]["memory_state"] == [(0, 1024, True, None)]
+    assert log[2] == {"time": 2, "process_id": 1, "memory_state": [(0, 150, False, 1), (150, 874, True, None)]}
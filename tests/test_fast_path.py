@@ -0,0 +1,67 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import random
+import numpy as np
+import pytest
+from fast_path import fcfs_schedule
+from process_table import ProcessTable
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+def results(processes):
+    return [(p.process_id, p.admission_time, p.start_time, p.completion_time, p.waiting_time, p.turnaround_time,
+             p.blocked_time, p.remaining_time) for p in processes]
+
+
+def test_fcfs_schedule_closed_form():
+    start, completion = fcfs_schedule(np.array([0, 2, 3, 20]), np.array([10, 4, 6, 1]))
+
+    assert start.tolist() == [0, 10, 14, 20]
+    assert completion.tolist() == [10, 14, 20, 21]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fast_engine_matches_event_engine(seed):
+    rng = random.Random(seed)
+    spec = [(pid, rng.randint(0, 100), rng.randint(1, 9), rng.choice([50, 100, 4000])) for pid in range(40)]
+    rng.shuffle(spec)
+
+    event = Scheduler(MemoryManager(total_memory=3000), engine="event")
+    event.run([Process(*p) for p in spec])
+    fast = Scheduler(MemoryManager(total_memory=3000), engine="fast")
+    fast.run([Process(*p) for p in spec])
+
+    assert fast.closed_form
+    assert results(fast.completed_processes) == results(event.completed_processes)
+    assert [p.process_id for p in fast.rejected_processes] == [p.process_id for p in event.rejected_processes]
+    assert fast.get_stats() == event.get_stats()
+    assert fast.time == event.time
+
+
+def test_fast_engine_writes_into_table():
+    table = ProcessTable()
+    for spec in [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 100)]:
+        table.append(*spec)
+
+    scheduler = Scheduler(MemoryManager(total_memory=1024), engine="fast")
+    scheduler.run(table)
+
+    assert table.numpy_column("completion_time").tolist() == [10, 14, 20]
+    assert [p.process_id for p in scheduler.completed_processes] == [1, 2, 3]
+
+
+def test_fast_engine_falls_back_when_memory_can_block():
+    spec = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500)]
+
+    fast = Scheduler(MemoryManager(total_memory=1024), engine="fast")
+    fast.run([Process(*p) for p in spec])
+    event = Scheduler(MemoryManager(total_memory=1024), engine="event")
+    event.run([Process(*p) for p in spec])
+
+    assert not fast.closed_form
+    assert fast.trace.segments == event.trace.segments
+    assert results(fast.completed_processes) == results(event.completed_processes)
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import math
+import random
+from free_space import FreeSizeIndex, FreeAddressTree
+
+
+def test_size_index_prefers_smallest_then_lowest_address():
+    index = FreeSizeIndex()
+    for start, size in [(0, 300), (400, 200), (700, 200), (1000, 100)]:
+        index.add(start, size)
+
+    assert index.best_fit(150) == 400
+    index.remove(400, 200)
+    assert index.best_fit(150) == 700
+    assert index.best_fit(301) is None
+
+
+def test_address_tree_finds_lowest_fitting_block():
+    tree = FreeAddressTree()
+    for start, size in [(500, 50), (0, 100), (900, 400), (300, 250)]:
+        tree.add(start, size)
+
+    assert tree.first_fit(100) == 0
+    assert tree.first_fit(200) == 300
+    assert tree.largest() == 400
+
+    tree.remove(300)
+    assert tree.first_fit(200) == 900
+    tree.remove(123)  # Not in the tree, nothing happens
+    assert tree.first_fit(500) is None
+
+
+def tree_height(root):
+    height, level = 0, [root] if root is not None else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+    return height
+
+
+def test_size_index_stays_balanced():
+    # Ascending sizes would degenerate an unbalanced tree; a sorted list has no tree at all
+    index = FreeSizeIndex()
+    count = 100000
+    for start in range(count):
+        index.add(start * 10, start + 1)
+    assert tree_height(index.root) < 4 * math.log2(count)
+
+    for start in range(0, count, 2):
+        index.remove(start * 10, start + 1)
+    assert tree_height(index.root) < 4 * math.log2(count)
+    assert index.best_fit(1) == 10
+    assert index.best_fit(count) == (count - 1) * 10
+    assert index.largest() == count
+    assert index.total == sum(range(2, count + 1, 2))
+
+
+def test_size_index_matches_sorted_list():
+    rng = random.Random(3)
+    index, entries = FreeSizeIndex(), []
+    for _ in range(5000):
+        if entries and rng.random() < 0.45:
+            size, start = entries.pop(rng.randrange(len(entries)))
+            index.remove(start, size)
+        else:
+            entry = (rng.randint(1, 200), rng.randrange(10 ** 6))
+            if entry not in entries:
+                entries.append(entry)
+                index.add(entry[1], entry[0])
+        entries.sort()
+        request = rng.randint(1, 210)
+        fitting = [entry for entry in entries if entry[0] >= request]
+        assert index.best_fit(request) == (fitting[0][1] if fitting else None)
+        assert index.largest() == (entries[-1][0] if entries else 0)
+        assert index.total == sum(size for size, _ in entries)
@@ -0,0 +1,70 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pstats
+from instrumentation import Instrumentation, profiled
+from scheduler import Scheduler
+from smp import SMPScheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+SPEC = [(1, 0, 5, 600), (2, 1, 3, 600), (3, 2, 4, 100), (4, 3, 2, 5000), (5, 4, 1, 300)]
+
+
+def run(scheduler_class=Scheduler, instrument=True, **kwargs):
+    scheduler = scheduler_class(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=2, engine="event",
+                                **kwargs)
+    instrumentation = Instrumentation().attach(scheduler) if instrument else None
+    scheduler.run([Process(*p) for p in SPEC])
+    return scheduler, instrumentation
+
+
+def test_counts_phases_and_allocations():
+    scheduler, instrumentation = run()
+    report = instrumentation.to_dict()
+
+    # Process 2 waits for process 1's memory and is retried after each of the 3 frees,
+    # process 4 never fits and is not even tried
+    assert report["allocation_attempts"] == 7
+    assert report["allocation_failures"] == 3
+    assert report["phases"]["memory.deallocate"]["calls"] == 4
+    assert report["phases"]["scheduler.complete_process"]["calls"] == 4
+    assert report["phases"]["scheduler.admit_arrived"]["total_ms"] > 0
+    assert report["peak_allocations"] == 3
+    assert report["peak_free_blocks"] >= 1
+
+
+def test_instrumentation_does_not_change_the_run():
+    plain, _ = run(instrument=False)
+    instrumented, instrumentation = run()
+
+    assert instrumented.trace.segments == plain.trace.segments
+    assert instrumented.get_stats() == plain.get_stats()
+
+    instrumentation.detach()
+    assert "allocate" not in vars(instrumented.memory_manager)
+    assert "admit_arrived" not in vars(instrumented)
+
+
+def test_smp_phases(tmp_path):
+    _, instrumentation = run(SMPScheduler, cpus=2)
+    path = tmp_path / "instrumentation.json"
+    instrumentation.write_json(path)
+
+    phases = json.loads(path.read_text())["phases"]
+    assert phases["scheduler.dispatch_on"]["calls"] > 0
+    assert phases["scheduler.dispatch"]["calls"] == 0
+    # Every core's segments are recorded through log_execution
+    assert phases["scheduler.log_execution"]["calls"] >= phases["scheduler.run_cores"]["calls"] * 2 > 0
+
+
+def test_profile_dump(tmp_path):
+    path = str(tmp_path / "run.pstats")
+    with profiled(path):
+        run(instrument=False)
+
+    functions = {name for _, _, name in pstats.Stats(path).stats}
+    assert "admit_arrived" in functions
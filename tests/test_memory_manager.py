@@ -3,6 +3,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import random
 import pytest
 from memory_manager import MemoryManager, MemoryBlock
 from process import Process
@@ -216,3 +217,107 @@ def test_fragmentation_case(memory_manager):
     assert total_free >= process.memory_required, (
         f"Total free memory is {total_free}, which should be enough, but fragmentation prevented allocation"
     )
+
+
+def test_deallocate_notifies_free_listeners(memory_manager, process_small):
+    freed = []
+    memory_manager.free_listeners.append(freed.append)
+
+    memory_manager.allocate(process_small)
+    memory_manager.deallocate(Process(999, 0, 5, 100))  # Owns no memory, nobody is woken up
+    memory_manager.deallocate(process_small)
+
+    assert freed == [process_small]
+
+
+def linear_fit(blocks, size, best):
+    # Reference placement: the original linear scans over the block list
+    fitting = [block for block in blocks if block.is_free and block.size >= size]
+    if not fitting:
+        return None
+    return min(fitting, key=lambda block: block.size).start if best else fitting[0].start
+
+
+@pytest.mark.parametrize("strategy", ["first_fit", "best_fit"])
+def test_indexed_fit_matches_linear_scan(strategy):
+    rng = random.Random(7)
+    memory_manager = MemoryManager(total_memory=10000, strategy=strategy)
+    live = []
+
+    for pid in range(500):
+        if live and rng.random() < 0.4:
+            memory_manager.deallocate(live.pop(rng.randrange(len(live))))
+        process = Process(pid, 0, 1, rng.choice([10, 50, 120, 300, 700]))
+        expected = linear_fit(memory_manager.blocks, process.memory_required, strategy == "best_fit")
+
+        assert memory_manager.allocate(process) is (expected is not None)
+        if expected is not None:
+            live.append(process)
+            block = next(block for block in memory_manager.blocks if block.process_id == pid)
+            assert block.start == expected
+
+
+def test_deallocate_coalesces_with_neighbours(memory_manager):
+    processes = [Process(pid, 0, 1, 100) for pid in range(1, 5)]
+    for process in processes:
+        memory_manager.allocate(process)
+
+    memory_manager.deallocate(processes[1])
+    memory_manager.deallocate(processes[3])  # Merges with the free tail
+    assert [(block.start, block.size, block.is_free) for block in memory_manager.blocks] == [
+        (0, 100, False), (100, 100, True), (200, 100, False), (300, 724, True),
+    ]
+
+    memory_manager.deallocate(processes[2])  # Bridges both free neighbours
+    assert [(block.start, block.size, block.is_free) for block in memory_manager.blocks] == [
+        (0, 100, False), (100, 924, True),
+    ]
+    assert list(memory_manager.blocks_by_pid) == [1]
+    assert memory_manager.blocks[1].prev is memory_manager.blocks[0]
+
+
+def test_fragmentation_metrics(memory_manager):
+    memory_manager.blocks = [
+        MemoryBlock(0, 100, False, 1),
+        MemoryBlock(100, 100, True),
+        MemoryBlock(200, 150, False, 2),
+        MemoryBlock(350, 300, True),
+    ]
+
+    assert memory_manager.free_memory == 400
+    assert memory_manager.largest_free_block == 300
+    assert memory_manager.free_block_count == 2
+    assert memory_manager.external_fragmentation == 0.25
+
+
+def test_compaction_on_fragmented_allocation():
+    memory_manager = MemoryManager(total_memory=700, compaction_threshold=0.2, compaction_cost=0.5)
+    memory_manager.blocks = [
+        MemoryBlock(0, 100, False, 1),
+        MemoryBlock(100, 100, True),
+        MemoryBlock(200, 150, False, 2),
+        MemoryBlock(350, 100, True),
+        MemoryBlock(450, 150, False, 3),
+        MemoryBlock(600, 100, True),
+    ]
+
+    assert memory_manager.allocate(Process(99, 0, 5, 180)) is True
+    assert [(block.start, block.size, block.process_id) for block in memory_manager.blocks] == [
+        (0, 100, 1), (100, 150, 2), (250, 150, 3), (400, 180, 99), (580, 120, None),
+    ]
+    assert memory_manager.compaction_bytes_moved == 300
+    assert memory_manager.take_compaction_time() == 150
+    assert memory_manager.take_compaction_time() == 0
+
+
+def test_no_compaction_below_threshold():
+    memory_manager = MemoryManager(total_memory=700, compaction_threshold=0.9)
+    memory_manager.blocks = [
+        MemoryBlock(0, 100, False, 1),
+        MemoryBlock(100, 100, True),
+        MemoryBlock(200, 300, False, 2),
+        MemoryBlock(500, 200, True),
+    ]
+
+    assert memory_manager.allocate(Process(99, 0, 5, 250)) is False
+    assert memory_manager.compactions == 0
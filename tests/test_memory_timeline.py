@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from memory_manager import MemoryManager
+from process import Process
+
+
+@pytest.fixture
+def memory_manager():
+    return MemoryManager(total_memory=1024, keyframe_interval=2)
+
+
+def test_timeline_records_split_free_and_merge(memory_manager):
+    process_a = Process(process_id=1, arrival_time=0, burst_time=5, memory_required=150)
+    process_b = Process(process_id=2, arrival_time=0, burst_time=5, memory_required=200)
+
+    memory_manager.allocate(process_a)
+    memory_manager.allocate(process_b)
+    memory_manager.deallocate(process_b)
+
+    assert memory_manager.timeline.events == [
+        ("split", 0, 150, 1),
+        ("split", 150, 200, 2),
+        ("free", 150),
+        ("merge", 150),
+    ]
+
+
+def test_layout_replayed_from_nearest_keyframe(memory_manager):
+    processes = [Process(pid, 0, 5, 100) for pid in range(1, 6)]
+    layouts = [memory_manager.timeline.snapshot(memory_manager.blocks)]
+
+    for process in processes:
+        memory_manager.allocate(process)
+        layouts.append(memory_manager.timeline.snapshot(memory_manager.blocks))
+    memory_manager.deallocate(processes[2])
+    layouts.append(memory_manager.timeline.snapshot(memory_manager.blocks))  # Free without a merge
+
+    timeline = memory_manager.timeline
+    assert len(timeline.keyframes) > 1, "Keyframes should be taken every 2 events"
+    for position, layout in enumerate(layouts):
+        assert timeline.layout_at(position) == layout
+    assert list(timeline.layouts(range(len(layouts)))) == layouts
@@ -0,0 +1,82 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from policies import POLICIES, create_policy
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+def completion_times(algorithm, processes, engine="tick", time_quantum=None):
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=time_quantum,
+                          engine=engine)
+    processes = [Process(*p) for p in processes]
+    scheduler.run(processes)
+    return {p.process_id: p.completion_time for p in processes}
+
+
+def test_registry_has_all_algorithms():
+    assert {"FCFS", "RR", "SJF", "SRTF", "PRIORITY", "MLFQ"} <= set(POLICIES)
+    with pytest.raises(ValueError):
+        create_policy("LOTTERY")
+
+
+@pytest.mark.parametrize("algorithm", ["RR", "MLFQ"])
+@pytest.mark.parametrize("time_quantum", [0, -2])
+def test_quantum_must_be_positive(algorithm, time_quantum):
+    # A zero quantum used to keep the event engine requeueing the same process forever
+    with pytest.raises(ValueError):
+        create_policy(algorithm, time_quantum)
+    with pytest.raises(ValueError):
+        Scheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=time_quantum, engine="event")
+
+
+def test_cli_rejects_non_positive_quantum(capsys):
+    from cli import build_parser
+
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--file", "processes.json", "--scheduler", "RR", "--quantum", "0"])
+    assert "must be a positive integer" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_sjf_runs_shortest_job_after_current(engine):
+    processes = [(1, 0, 8, 100), (2, 1, 4, 100), (3, 2, 9, 100), (4, 3, 5, 100)]
+
+    assert completion_times("SJF", processes, engine) == {1: 8, 2: 12, 3: 26, 4: 17}
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_srtf_preempts_for_shorter_remaining_time(engine):
+    processes = [(1, 0, 8, 100), (2, 1, 4, 100), (3, 2, 9, 100), (4, 3, 5, 100)]
+
+    assert completion_times("SRTF", processes, engine) == {1: 17, 2: 5, 3: 26, 4: 10}
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_priority_preempts_for_lower_value(engine):
+    processes = [(1, 0, 5, 100, 2), (2, 1, 3, 100, 1), (3, 2, 2, 100, 3)]
+
+    assert completion_times("PRIORITY", processes, engine) == {1: 8, 2: 4, 3: 10}
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_mlfq_demotes_and_preempts(engine):
+    # Process 1 uses its level 0 quantum (2) and drops to level 1 (quantum 4),
+    # process 2 enters level 0 at t=3 and preempts it
+    processes = [(1, 0, 7, 100), (2, 3, 2, 100)]
+
+    assert completion_times("MLFQ", processes, engine, time_quantum=2) == {1: 9, 2: 5}
+
+
+def test_heap_policy_iterates_in_pick_order():
+    ready_queue = create_policy("SJF")
+    processes = [Process(1, 0, 5, 10), Process(2, 0, 3, 10), Process(3, 0, 5, 10)]
+    for p in processes:
+        ready_queue.add(p)
+
+    assert [p.process_id for p in ready_queue] == [2, 1, 3]
+    assert ready_queue.pop() is processes[1]
+    assert len(ready_queue) == 2
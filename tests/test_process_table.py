@@ -0,0 +1,54 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from process_table import ProcessTable
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+SPEC = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500), (4, 30, 3, 2000), (5, 1, 5, 100, 2)]
+
+
+def test_process_has_no_instance_dict():
+    process = Process(1, 0, 5, 100)
+
+    assert not hasattr(process, "__dict__")
+    with pytest.raises(AttributeError):
+        process.unknown = 1
+
+
+def test_views_read_and_write_columns():
+    table = ProcessTable()
+    for spec in SPEC:
+        table.append(*spec)
+
+    view = table[1]
+    assert (view.process_id, view.arrival_time, view.remaining_time, view.start_time) == (2, 2, 4, None)
+    view.start_time = 7
+    view.remaining_time -= 1
+    assert table.by_pid(2).start_time == 7
+    assert table.numpy_column("remaining_time").tolist() == [10, 3, 6, 3, 5]
+    assert table[-1].priority == 2
+    with pytest.raises(KeyError):
+        table.by_pid(99)
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "PRIORITY"])
+def test_scheduler_runs_on_table(algorithm):
+    processes = [Process(*spec) for spec in SPEC]
+    table = ProcessTable.from_processes(processes)
+
+    by_objects = Scheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=2)
+    by_objects.run(processes)
+    by_table = Scheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=2)
+    by_table.run(table)
+
+    assert by_table.trace.segments == by_objects.trace.segments
+    assert by_table.get_stats() == by_objects.get_stats()
+    assert [p.process_id for p in by_table.rejected_processes] == [4]
+    # Results end up in the table's columns
+    assert [table.by_pid(p.process_id).completion_time for p in processes] == \
+           [p.completion_time for p in processes]
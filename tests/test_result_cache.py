@@ -0,0 +1,94 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+from result_cache import ResultCache
+
+
+CONFIG = {"scheduler": "RR", "quantum": 4, "memory": 1024, "strategy": "first_fit"}
+
+
+def write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+    return str(path)
+
+
+def test_key_depends_on_contents_and_config(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    workload = write(tmp_path / "a.json", '{"processes": []}')
+    copy = write(tmp_path / "b.json", '{"processes": []}')
+    key = cache.key(workload, CONFIG)
+
+    assert cache.key(copy, dict(reversed(CONFIG.items()))) == key
+    assert cache.key(workload, {**CONFIG, "quantum": 2}) != key
+    write(workload, '{"processes": [] }')
+    assert cache.key(workload, CONFIG) != key
+
+
+def test_store_and_get(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    chart = write(tmp_path / "chart.png", "png")
+    meta = {"stats": {"throughput": 0.5}, "rejected": [], "closed_form": False}
+
+    assert cache.get("k") is None
+    cache.store("k", meta, {"chart.png": chart, "trace.npz": None})
+    entry, cached = cache.get("k")
+
+    assert cached == meta
+    assert sorted(os.listdir(entry)) == ["chart.png", "meta.json"]
+    # Storing a key that is already cached keeps the first entry
+    cache.store("k", {**meta, "closed_form": True}, {})
+    assert cache.get("k")[1] == meta
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=2500)
+    data = write(tmp_path / "data", "x" * 1000)
+    cache.store("first", {}, {"data": data})
+    cache.store("second", {}, {"data": data})
+    os.utime(os.path.join(cache.directory, "first"), (0, 0))
+    os.utime(os.path.join(cache.directory, "second"), (1, 1))
+    cache.get("first")  # Now more recently used than second
+    cache.store("third", {}, {"data": data})
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None and cache.get("third") is not None
+
+    cache.clear()
+    assert cache.entries() == []
+
+
+def cli_args(tmp_path, *extra):
+    from cli import build_parser
+
+    workload = write(tmp_path / "workload.json", json.dumps({"processes": [
+        {"process_id": 1, "arrival_time": 0, "burst_time": 3, "memory_required": 100}]}))
+    return build_parser().parse_args(["--file", workload, "--cache-dir", str(tmp_path / "cache"), *extra])
+
+
+def test_cli_caches_a_trace_only_when_asked_for(tmp_path):
+    from cli import simulate
+
+    results = simulate(cli_args(tmp_path, "--no-charts"))
+    cache = ResultCache(str(tmp_path / "cache"))
+    [(_, _, entry)] = cache.entries()
+    assert os.listdir(entry) == ["meta.json"]
+
+    trace = str(tmp_path / "run.npz")
+    assert simulate(cli_args(tmp_path, "--no-charts", "--trace-out", trace)) == results
+    assert len(cache.entries()) == 2 and os.path.exists(trace)
+
+
+def test_cli_simulates_when_a_hit_was_evicted(tmp_path, monkeypatch):
+    from cli import simulate
+
+    args = cli_args(tmp_path, "--no-charts", "--trace-out", str(tmp_path / "run.npz"))
+    results = simulate(args)
+    os.remove(args.trace_out)
+    # The entry disappears between the lookup and copying its files
+    monkeypatch.setattr(ResultCache, "get", lambda self, key: (str(tmp_path / "evicted"), results))
+
+    assert simulate(args) == results
+    assert os.path.exists(args.trace_out)
@@ -87,3 +87,141 @@ def test_rejects_process_when_memory_insufficient(scheduler, process_large):
 
     assert process_large.completion_time is None
     assert process_large in scheduler.rejected_processes
+
+
+def run_with_engine(engine, algorithm, processes, total_memory=1024, time_quantum=4):
+    scheduler = Scheduler(MemoryManager(total_memory=total_memory), algorithm=algorithm,
+                          time_quantum=time_quantum, engine=engine)
+    scheduler.run([Process(*p) for p in processes])
+    return scheduler
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SJF", "SRTF", "PRIORITY", "MLFQ"])
+def test_event_engine_matches_tick_engine(algorithm):
+    # Idle gaps, memory pressure and a rejected process must give identical results in both engines
+    processes = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500), (4, 30, 3, 2000), (5, 40, 5, 100)]
+
+    tick = run_with_engine("tick", algorithm, processes)
+    event = run_with_engine("event", algorithm, processes)
+
+    assert [(p.process_id, p.start_time, p.completion_time) for p in event.completed_processes] == \
+           [(p.process_id, p.start_time, p.completion_time) for p in tick.completed_processes]
+    assert event.get_stats() == tick.get_stats()
+    assert [p.process_id for p in event.rejected_processes] == [p.process_id for p in tick.rejected_processes]
+    assert event.trace.segments == tick.trace.segments
+    assert list(event.trace.memory_snapshots()) == list(tick.trace.memory_snapshots())
+
+
+def test_event_engine_jumps_over_idle_time():
+    scheduler = run_with_engine("event", "FCFS", [(1, 1000, 5, 100)])
+
+    assert scheduler.completed_processes[0].completion_time == 1005
+    assert scheduler.time == 1005
+
+
+def test_waiting_processes_hold_memory_blocked_arrivals(memory_manager):
+    # A process that fits total memory but not the free space waits without blocking the arrival cursor
+    scheduler = Scheduler(memory_manager)
+    big = Process(process_id=1, arrival_time=0, burst_time=5, memory_required=900)
+    blocked = Process(process_id=2, arrival_time=1, burst_time=2, memory_required=500)
+    small = Process(process_id=3, arrival_time=1, burst_time=2, memory_required=100)
+    scheduler.remaining_processes.extend([big, blocked, small])
+
+    scheduler.admit_arrived()
+    scheduler.time = 1
+    scheduler.admit_arrived()
+
+    assert list(scheduler.ready_queue) == [big, small]
+    assert list(scheduler.waiting_processes) == [blocked]
+    assert not scheduler.remaining_processes
+
+
+@pytest.mark.parametrize("admission, expected_order", [("backfill", [1, 3, 2]), ("fifo", [1, 2, 3])])
+def test_admission_policy(admission, expected_order):
+    # Process 2 waits for process 1's memory; backfilling lets the small process 3 run first
+    scheduler = Scheduler(MemoryManager(total_memory=1000), admission=admission)
+    processes = [Process(1, 0, 5, 600), Process(2, 1, 2, 500), Process(3, 2, 2, 100)]
+
+    scheduler.run(processes)
+
+    assert [p.process_id for p in scheduler.completed_processes] == expected_order
+    assert processes[1].admission_time == 5
+    assert processes[1].blocked_time == 4
+    assert processes[2].blocked_time == (0 if admission == "backfill" else 3)
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_compaction_stalls_the_schedule(engine):
+    # When process 2 finishes at t=7 the free space (250 + 150) is enough for process 5 but split in two holes,
+    # compaction slides processes 3 and 4 down: 300 bytes moved cost 3 time units
+    memory_manager = MemoryManager(total_memory=700, compaction_threshold=0.2, compaction_cost=0.01)
+    scheduler = Scheduler(memory_manager, engine=engine)
+    processes = [Process(1, 0, 2, 100), Process(2, 0, 5, 150), Process(3, 0, 2, 150),
+                 Process(4, 0, 5, 150), Process(5, 6, 3, 300)]
+
+    scheduler.run(processes)
+
+    assert memory_manager.compactions == 1
+    assert processes[4].admission_time == 7
+    assert memory_manager.compaction_time == 3
+    assert scheduler.time == sum(p.burst_time for p in processes) + memory_manager.compaction_time
+
+
+@pytest.mark.parametrize("engine", ["tick", "event"])
+def test_stepping_matches_run(engine):
+    processes = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500), (4, 30, 3, 2000), (5, 40, 5, 100)]
+    whole = run_with_engine(engine, "RR", processes)
+
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=4, engine=engine)
+    scheduler.start([Process(*p) for p in processes])
+    assert scheduler.run_until(7)
+    assert scheduler.time == 7
+    assert scheduler.step(2)
+    assert not scheduler.run_until()
+
+    assert scheduler.trace.segments == whole.trace.segments
+    assert scheduler.get_stats() == whole.get_stats()
+
+
+def test_events_are_yielded_as_they_happen():
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=2, engine="event")
+    scheduler.start([Process(1, 0, 3, 600), Process(2, 1, 2, 600), Process(3, 1, 1, 2000)])
+
+    events = scheduler.events()
+    assert [next(events)["type"] for _ in range(4)] == ["arrival", "alloc", "admit", "dispatch"]
+    # Events come out one engine step at a time: the first step ran the first slice
+    assert scheduler.time == 2
+
+    rest = [(event["type"], event["time"], event["process_id"]) for event in events]
+    assert rest == [("arrival", 1, 2), ("arrival", 1, 3), ("reject", 1, 3),
+                    ("preempt", 2, 1), ("dispatch", 2, 1), ("complete", 3, 1), ("free", 3, 1),
+                    ("alloc", 3, 2), ("admit", 3, 2), ("dispatch", 3, 2), ("complete", 5, 2), ("free", 5, 2)]
+    assert scheduler.event_listeners == []
+
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_unrecorded_run_keeps_nothing_per_process(cpus):
+    from smp import SMPScheduler
+    from workload import generate_processes
+
+    def build(**kwargs):
+        memory_manager = MemoryManager(total_memory=4096)
+        if cpus > 1:
+            return SMPScheduler(memory_manager, algorithm="RR", time_quantum=4, engine="event", cpus=cpus, **kwargs)
+        return Scheduler(memory_manager, algorithm="RR", time_quantum=4, engine="event", **kwargs)
+
+    recorded = build()
+    recorded.run(generate_processes(2000, seed=5), sorted_arrivals=True)
+
+    scheduler = build(keep_completed=False, record_trace=False)
+    scheduler.start(generate_processes(2000, seed=5), sorted_arrivals=True)
+    events = sum(1 for _ in scheduler.events())
+
+    assert events > 10000
+    assert scheduler.get_stats() == recorded.get_stats()
+    assert scheduler.completed_processes == []
+    for trace in [core.trace for core in scheduler.cores] if cpus > 1 else [scheduler.trace]:
+        assert trace.segments == [] and trace.memory_changes == []
+    assert scheduler.memory_manager.timeline.events == []
+    assert len(scheduler.memory_manager.timeline.keyframes) == 1
+    assert getattr(scheduler, "last_core", {}) == {}
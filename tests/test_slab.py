@@ -0,0 +1,65 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from memory_manager import MemoryManager
+from process import Process
+
+
+@pytest.fixture
+def memory_manager():
+    # 10000 / 16 = 625 bytes per slab: 4 slots of 150, 3 slots of 200
+    return MemoryManager(total_memory=10000, strategy="slab", size_classes=[150, 200])
+
+
+def used_blocks(memory_manager):
+    return [(block.start, block.size, block.process_id) for block in memory_manager.blocks if not block.is_free]
+
+
+def test_slots_are_carved_from_one_slab(memory_manager):
+    processes = [Process(pid, 0, 5, 150) for pid in range(1, 4)]
+    for process in processes:
+        assert memory_manager.allocate(process) is True
+
+    assert used_blocks(memory_manager) == [(0, 150, 1), (150, 150, 2), (300, 150, 3)]
+    stats = memory_manager.slab_stats()[150]
+    assert (stats["slabs"], stats["slots"], stats["used"]) == (1, 4, 3)
+    assert stats["waste"] == 150, "One slot is still free"
+
+
+def test_close_sizes_round_up_and_odd_sizes_fall_back(memory_manager):
+    assert memory_manager.allocate(Process(1, 0, 5, 140)) is True  # Within 1/8 of 150
+    assert memory_manager.allocate(Process(2, 0, 5, 1000)) is True  # No class, first fit
+
+    assert used_blocks(memory_manager) == [(0, 150, 1), (600, 1000, 2)]
+    assert memory_manager.slab_stats()[150]["avg_waste_per_allocation"] == 10
+
+
+def test_freed_slot_is_reused_and_empty_slabs_released(memory_manager):
+    first = [Process(pid, 0, 5, 200) for pid in range(1, 4)]
+    second = [Process(pid, 0, 5, 200) for pid in range(4, 7)]
+    for process in first + second:
+        memory_manager.allocate(process)
+    assert memory_manager.slab_stats()[200]["slabs"] == 2
+
+    memory_manager.deallocate(first[1])
+    reused = Process(7, 0, 5, 200)
+    memory_manager.allocate(reused)
+    assert (200, 200, 7) in used_blocks(memory_manager), "The freed slot is handed out again"
+
+    for process in first[:1] + first[2:] + second + [reused]:
+        memory_manager.deallocate(process)
+    assert memory_manager.slab_stats()[200]["slabs"] == 1, "Only one empty slab stays cached"
+
+    memory_manager.reclaim_slabs()
+    assert [(block.start, block.size, block.is_free) for block in memory_manager.blocks] == [(0, 10000, True)]
+
+
+def test_cached_slab_is_reclaimed_for_large_process():
+    memory_manager = MemoryManager(total_memory=1000, strategy="slab", size_classes=[150])
+    small = Process(1, 0, 5, 150)
+    memory_manager.allocate(small)
+    memory_manager.deallocate(small)
+
+    assert memory_manager.allocate(Process(2, 0, 5, 1000)) is True
@@ -0,0 +1,70 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from scheduler import Scheduler
+from smp import SMPScheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+PROCESSES = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500), (4, 4, 3, 100), (5, 4, 7, 200),
+             (6, 30, 3, 2000), (7, 40, 5, 100), (8, 41, 2, 100)]
+
+
+def run_smp(engine, algorithm, processes, **kwargs):
+    scheduler = SMPScheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=2,
+                             engine=engine, **kwargs)
+    scheduler.run([Process(*p) for p in processes])
+    return scheduler
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SRTF", "MLFQ"])
+def test_single_cpu_matches_scheduler(algorithm):
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm=algorithm, time_quantum=2)
+    scheduler.run([Process(*p) for p in PROCESSES])
+    smp = run_smp("event", algorithm, PROCESSES, cpus=1)
+
+    assert [(p.process_id, p.completion_time) for p in smp.completed_processes] == \
+           [(p.process_id, p.completion_time) for p in scheduler.completed_processes]
+    assert smp.trace.segments == scheduler.trace.segments
+
+
+@pytest.mark.parametrize("balancing", ["global", "steal"])
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SJF", "PRIORITY", "MLFQ"])
+def test_event_engine_matches_tick_engine(algorithm, balancing):
+    tick = run_smp("tick", algorithm, PROCESSES, cpus=3, balancing=balancing)
+    event = run_smp("event", algorithm, PROCESSES, cpus=3, balancing=balancing)
+
+    assert [(p.process_id, p.start_time, p.completion_time) for p in event.completed_processes] == \
+           [(p.process_id, p.start_time, p.completion_time) for p in tick.completed_processes]
+    assert [core.trace.segments for core in event.cores] == [core.trace.segments for core in tick.cores]
+    assert event.core_stats() == tick.core_stats()
+    assert [p.process_id for p in event.rejected_processes] == [6]
+
+
+def test_idle_core_steals_work():
+    # Process 3 is queued on core 0 behind process 1, core 1 takes it once process 2 is done
+    scheduler = run_smp("event", "FCFS", [(1, 0, 10, 100), (2, 0, 2, 100), (3, 0, 3, 100)], cpus=2)
+
+    assert {p.process_id: p.completion_time for p in scheduler.completed_processes} == {1: 10, 2: 2, 3: 5}
+    assert [(core["steals"], core["utilization"]) for core in scheduler.core_stats()] == [(0, 1.0), (1, 0.5)]
+    stats = scheduler.get_stats()
+    assert (stats["core0_utilization"], stats["core1_utilization"]) == (1.0, 0.5)
+
+
+def test_global_queue_counts_migrations():
+    scheduler = run_smp("tick", "RR", [(1, 0, 4, 100), (2, 0, 4, 100), (3, 0, 4, 100)], cpus=2,
+                        balancing="global")
+
+    assert {p.process_id: p.completion_time for p in scheduler.completed_processes} == {1: 4, 2: 6, 3: 6}
+    stats = scheduler.get_stats()
+    assert stats["migrations"] == stats["core0_migrations"] + stats["core1_migrations"] == 3
+
+
+def test_cli_rejects_non_positive_cpus():
+    from cli import build_parser
+
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--file", "processes.json", "--cpus", "0"])
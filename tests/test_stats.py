@@ -0,0 +1,93 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import math
+import random
+import pytest
+from stats import QuantileSketch, RunningMoments, StatsAccumulator
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.expovariate(0.01) for _ in range(10000)] + [0] * 500
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    values.sort()
+    for q in (0.0, 0.01, 0.5, 0.95, 0.99, 1.0):
+        exact = values[max(math.ceil(q * len(values)) - 1, 0)]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert len(sketch.buckets) < 1000
+
+
+def test_merged_sketches_match_one_sketch():
+    values = list(range(1000))
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in values:
+        whole.add(value)
+        (left if value % 3 else right).add(value)
+    left.merge(right)
+
+    assert left.count == whole.count
+    assert [left.quantile(q / 100) for q in range(101)] == [whole.quantile(q / 100) for q in range(101)]
+
+
+def test_running_moments():
+    moments, other = RunningMoments(), RunningMoments()
+    for value in (2, 4, 4):
+        moments.add(value)
+    other.add(5, count=2)
+    moments.merge(other)
+
+    assert moments.count == 5
+    assert moments.mean == 4.0
+    assert moments.variance == pytest.approx(1.2)
+    assert (moments.minimum, moments.maximum) == (2, 5)
+
+
+def run(spec, **kwargs):
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=2, engine="event", **kwargs)
+    scheduler.run([Process(*p) for p in spec])
+    return scheduler
+
+
+def test_scheduler_stats_without_keeping_processes():
+    spec = [(1, 0, 5, 600), (2, 1, 3, 600), (3, 2, 4, 100), (4, 3, 2, 5000)]
+    kept = run(spec)
+    streamed = run(spec, keep_completed=False)
+
+    assert streamed.completed_processes == []
+    assert streamed.get_stats() == kept.get_stats()
+
+    stats = kept.get_stats()
+    completed = kept.completed_processes
+    assert stats["avg_waiting_time"] == sum(p.waiting_time for p in completed) / len(completed)
+    assert stats["avg_response_time"] == sum(p.start_time - p.admission_time for p in completed) / len(completed)
+    assert stats["p99_turnaround_time"] == pytest.approx(max(p.turnaround_time for p in completed), rel=0.01)
+    assert stats["throughput"] == 3 / kept.time
+    assert stats["cpu_utilization"] == 12 / kept.time
+
+
+def test_merging_runs():
+    first = run([(1, 0, 5, 600), (2, 1, 3, 600)])
+    second = run([(1, 0, 2, 100), (2, 0, 7, 100), (3, 4, 1, 100)])
+    together = StatsAccumulator()
+    together.merge(first.stats)
+    together.merge(second.stats)
+
+    assert together.completed == 5
+    assert together.busy_time == 18
+    assert together.moments["turnaround_time"].total == sum(
+        p.turnaround_time for p in first.completed_processes + second.completed_processes)
+    assert together.sketches["waiting_time"].count == 5
+
+
+def test_rejected_processes_are_records():
+    scheduler = run([(1, 0, 5, 600), (2, 1, 3, 5000)])
+
+    assert scheduler.get_rejected_processes() == [{"process_id": 2, "arrival_time": 1, "memory_required": 5000}]
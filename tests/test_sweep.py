@@ -0,0 +1,46 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sweep import build_grid, run_sweep, format_table
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+def workload():
+    return [Process(1, 0, 10, 600), Process(2, 2, 4, 300), Process(3, 3, 6, 500), Process(4, 5, 2, 2000)]
+
+
+def test_build_grid_covers_every_combination():
+    grid = build_grid(["FCFS", "RR"], [2, 4], [1024], ["first_fit", "best_fit"])
+
+    assert len(grid) == 8
+    assert grid[0] == ("FCFS", 2, 1024, "first_fit")
+    assert grid[-1] == ("RR", 4, 1024, "best_fit")
+
+
+def test_parallel_sweep_matches_direct_runs():
+    grid = build_grid(["FCFS", "RR"], [3], [1024, 2048], ["first_fit", "buddy"])
+
+    rows = run_sweep(workload(), grid, workers=2)
+
+    assert [(row["scheduler"], row["memory"], row["strategy"]) for row in rows] == \
+           [(algorithm, memory, strategy) for algorithm, _, memory, strategy in grid]
+    for row, (algorithm, quantum, memory, strategy) in zip(rows, grid):
+        scheduler = Scheduler(MemoryManager(memory, strategy), algorithm=algorithm, time_quantum=quantum)
+        scheduler.run(workload())
+        assert {key: row[key] for key in scheduler.get_stats()} == scheduler.get_stats()
+        assert row["rejected"] == len(scheduler.rejected_processes)
+        assert row["makespan"] == scheduler.time
+    assert rows[0]["rejected"] == 1 and rows[2]["rejected"] == 0
+
+
+def test_format_table_aligns_columns():
+    table = format_table([{"scheduler": "FCFS", "throughput": 0.5}, {"scheduler": "RR", "rejected": 2}])
+
+    header, rule, first, second = table.splitlines()
+    assert header.split() == ["scheduler", "throughput", "rejected"]
+    assert first.split() == ["FCFS", "0.50", "-"]
+    assert second.split() == ["RR", "-", "2"]
+    assert len(header) == len(rule) == len(first) == len(second)
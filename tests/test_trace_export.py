@@ -0,0 +1,91 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
+import pytest
+from trace_export import write_trace, TraceReader
+from memory_timeline import MemoryTimeline
+from scheduler import Scheduler
+from smp import SMPScheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+SPEC = [(1, 0, 10, 600), (2, 2, 4, 300), (3, 3, 6, 500), (4, 30, 3, 2000), (5, 40, 5, 100)]
+
+
+def run(scheduler_class=Scheduler, **kwargs):
+    scheduler = scheduler_class(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=3, engine="event",
+                                **kwargs)
+    scheduler.run([Process(*p) for p in SPEC])
+    return scheduler
+
+
+@pytest.fixture
+def written(tmp_path):
+    scheduler = run()
+    path = str(tmp_path / "trace.npz")
+    write_trace(path, scheduler)
+    return scheduler, TraceReader(path)
+
+
+def test_columns_are_memory_mapped(written):
+    scheduler, reader = written
+
+    assert isinstance(reader["segment.start"], np.memmap)
+    assert reader.meta["time"] == scheduler.time
+    assert reader.meta["stats"] == scheduler.get_stats()
+
+
+def test_segments_by_time_range_and_process(written):
+    scheduler, reader = written
+    segments = [(-1 if pid is None else pid, start, end) for pid, start, end in scheduler.trace.segments]
+
+    def rows(columns):
+        return list(zip(columns["process_id"].tolist(), columns["start"].tolist(), columns["end"].tolist()))
+
+    assert rows(reader.segments()) == segments
+    assert rows(reader.segments(5, 12)) == [s for s in segments if s[2] > 5 and s[1] < 12]
+    assert rows(reader.segments(process_id=1)) == [s for s in segments if s[0] == 1]
+    assert rows(reader.segments(process_id=-1)) == [s for s in segments if s[0] == -1]
+    assert rows(reader.segments(process_id=7)) == []
+
+
+def test_processes(written):
+    scheduler, reader = written
+
+    process = reader.processes(3)
+    expected = next(p for p in scheduler.completed_processes if p.process_id == 3)
+    assert process["completion_time"].tolist() == [expected.completion_time]
+    assert process["rejected"].tolist() == [0]
+    assert reader.processes(4)["rejected"].tolist() == [1]
+    assert reader.processes(4)["start_time"].tolist() == [-1]
+    assert reader.processes()["process_id"].tolist() == [1, 2, 3, 4, 5]
+    with pytest.raises(KeyError):
+        reader.processes(9)
+
+
+def test_memory_events_replay_to_the_recorded_layouts(written):
+    scheduler, reader = written
+    layout = [[start, size, bool(free), None if pid == -1 else pid] for start, size, free, pid in zip(
+        reader["layout.start"].tolist(), reader["layout.size"].tolist(),
+        reader["layout.free"].tolist(), reader["layout.process_id"].tolist())]
+
+    for time, expected in scheduler.trace.memory_snapshots():
+        replayed = [list(block) for block in layout]
+        for event in reader.iter_memory_events(end=time + 1):
+            MemoryTimeline.apply(replayed, event)
+        assert [tuple(block) for block in replayed] == list(expected)
+
+
+def test_smp_trace_has_every_core(tmp_path):
+    scheduler = run(SMPScheduler, cpus=2)
+    path = str(tmp_path / "trace.npz")
+    write_trace(path, scheduler)
+
+    reader = TraceReader(path)
+    segments = reader.segments()
+    assert sorted(set(segments["core"].tolist())) == [0, 1]
+    assert np.all(np.diff(segments["start"]) >= 0)
+    assert len(segments["start"]) == sum(len(core.trace.segments) for core in scheduler.cores)
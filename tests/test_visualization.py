@@ -0,0 +1,92 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
+from visualization import memory_raster, plot_gantt, trace_segments, gantt_density, process_colors
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+def run(processes, total_memory=100, engine="event"):
+    scheduler = Scheduler(MemoryManager(total_memory=total_memory), engine=engine)
+    scheduler.run(processes)
+    return scheduler
+
+
+def test_memory_raster_matches_the_log():
+    scheduler = run([Process(1, 0, 4, 30), Process(2, 1, 2, 50), Process(3, 6, 2, 20)])
+
+    raster, boundaries, labels, total_memory, end = memory_raster(scheduler.trace, rows=100, columns=100)
+
+    assert (total_memory, end) == (100, 8)
+    assert raster.shape == (8, 100)
+    for entry in scheduler.execution_log:
+        expected = np.zeros(100)
+        for start, size, is_free, _ in entry["memory_state"]:
+            expected[start:start + size] = not is_free
+        assert raster[entry["time"]].tolist() == expected.tolist()
+    assert boundaries[1].nonzero()[0].tolist() == [0, 30]
+
+
+def test_memory_raster_is_bounded_by_the_image():
+    processes = [Process(pid, pid * 3, 3, 10 + pid % 7) for pid in range(2000)]
+    scheduler = run(processes, total_memory=1000)
+
+    raster, _, labels, total_memory, end = memory_raster(scheduler.trace, rows=50, columns=40)
+
+    assert end == 6000
+    assert raster.shape == (50, 40)
+    # Each column covers 25 bytes, so shares are averaged over the blocks inside it
+    assert 0 < raster[:, 0].min() and raster.max() <= 1
+    assert labels == []
+
+
+def test_memory_raster_labels_long_lived_wide_blocks():
+    scheduler = run([Process(1, 0, 50, 60), Process(2, 0, 1, 10)])
+
+    _, _, labels, _, _ = memory_raster(scheduler.trace, rows=100, columns=100)
+
+    assert labels == [(30.0, 25.0, 1)]
+
+
+def test_trace_segments_leave_out_idle_time():
+    scheduler = run([Process(1, 2, 3, 10), Process(2, 9, 1, 10)])
+
+    process_ids, starts, ends = trace_segments(scheduler.trace)
+
+    assert process_ids.tolist() == [1, 2]
+    assert starts.tolist() == [2, 9]
+    assert ends.tolist() == [5, 10]
+
+
+def test_gantt_density_spreads_segments_over_bins():
+    lanes = np.array([0, 1, 2, 2])
+    starts = np.array([0, 3, 5, 9])
+    ends = np.array([3, 5, 9, 10])
+
+    density, lanes_per_row = gantt_density(lanes, starts, ends, rows=2, columns=4)
+
+    assert lanes_per_row == 2
+    # Bins are 2.5 time units wide; lanes 0 and 1 share the first row
+    assert density.tolist() == [[1.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 1.0]]
+    assert density.sum() * 2.5 == (ends - starts).sum()
+
+
+def test_process_colors_are_distinct():
+    colors = process_colors(np.arange(1000))
+
+    assert len({tuple(np.round(color, 3)) for color in colors}) == 1000
+
+
+def test_plot_gantt_with_idle_time_and_many_processes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "charts").mkdir()
+    scheduler = run([Process(pid, pid * 2, 1, 10) for pid in range(300)])
+    rejected = [{"process_id": pid, "memory_required": 500} for pid in range(20)]
+
+    plot_gantt(scheduler.trace, scheduler.get_stats(), rejected, max_lanes=500)
+    plot_gantt(scheduler.trace, scheduler.get_stats(), rejected, max_lanes=100)
+
+    assert (tmp_path / "charts" / "processes.png").exists()
@@ -0,0 +1,102 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import io
+import json
+import pytest
+from workload import (WorkloadError, iter_json_lines, iter_json_processes, read_processes, arrival_ordered,
+                      generate_processes, write_json_lines)
+from scheduler import Scheduler
+from memory_manager import MemoryManager
+from process import Process
+
+
+ENTRIES = [
+    {"process_id": 1, "arrival_time": 0, "burst_time": 10, "memory_required": 600},
+    {"process_id": 2, "arrival_time": 2, "burst_time": 4, "memory_required": 300, "priority": 1},
+    {"process_id": 3, "arrival_time": 3, "burst_time": 6, "memory_required": 500},
+]
+
+
+def fields(processes):
+    return [(p.process_id, p.arrival_time, p.burst_time, p.memory_required, p.priority) for p in processes]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_incremental_json_matches_json_load(chunk_size):
+    text = json.dumps({"name": "demo", "limits": [1, {"a": 12345}], "processes": ENTRIES}, indent=2)
+
+    processes = list(iter_json_processes(io.StringIO(text), chunk_size))
+
+    assert fields(processes) == [(1, 0, 10, 600, 0), (2, 2, 4, 300, 1), (3, 3, 6, 500, 0)]
+
+
+def test_incremental_json_errors():
+    with pytest.raises(KeyError):
+        list(iter_json_processes(io.StringIO('{"jobs": []}')))
+    with pytest.raises(WorkloadError):
+        list(iter_json_processes(io.StringIO('{"processes": [%s %s]}' % (json.dumps(ENTRIES[0]), json.dumps(ENTRIES[1])))))
+    assert list(iter_json_processes(io.StringIO('{"processes": []}'))) == []
+
+
+def test_json_lines(tmp_path):
+    path = tmp_path / "processes.jsonl"
+    path.write_text("\n".join(json.dumps(entry) for entry in ENTRIES) + "\n\n")
+
+    assert fields(read_processes(str(path))) == fields(iter_json_lines(io.StringIO(path.read_text())))
+    assert [p.process_id for p in read_processes(str(path))] == [1, 2, 3]
+
+
+def test_arrival_ordered_sorts_within_window():
+    processes = [Process(pid, arrival, 1, 10) for pid, arrival in [(1, 0), (2, 3), (3, 1), (4, 3), (5, 2), (6, 5)]]
+
+    assert [p.process_id for p in arrival_ordered(processes, window=2)] == [1, 3, 5, 2, 4, 6]
+    with pytest.raises(WorkloadError):
+        list(arrival_ordered(processes, window=1))
+
+
+def test_scheduler_pulls_arrivals_lazily():
+    scheduler = Scheduler(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=2, engine="event")
+    pulled_at = []
+
+    def stream():
+        for pid, arrival in enumerate([0, 5, 5, 40, 90]):
+            pulled_at.append(scheduler.time)
+            yield Process(pid, arrival, 3, 100)
+
+    scheduler.run(stream(), sorted_arrivals=True)
+
+    eager = Scheduler(MemoryManager(total_memory=1024), algorithm="RR", time_quantum=2, engine="event")
+    eager.run([Process(pid, arrival, 3, 100) for pid, arrival in enumerate([0, 5, 5, 40, 90])])
+    assert eager.trace.segments == scheduler.trace.segments
+    # Each process is only read once the previous one has arrived
+    assert pulled_at == [0, 0, 5, 5, 40]
+
+
+def test_scheduler_rejects_unsorted_stream():
+    scheduler = Scheduler(MemoryManager(total_memory=1024))
+
+    with pytest.raises(ValueError):
+        scheduler.run(iter([Process(1, 5, 1, 10), Process(2, 3, 1, 10)]), sorted_arrivals=True)
+
+
+@pytest.mark.parametrize("arrival", ["poisson", "bursty"])
+def test_generated_workload_is_reproducible_and_ordered(arrival):
+    first = list(generate_processes(2000, seed=7, arrival=arrival, priorities=3))
+    second = list(generate_processes(2000, seed=7, arrival=arrival, priorities=3))
+
+    assert fields(first) == fields(second)
+    assert fields(first) != fields(generate_processes(2000, seed=8, arrival=arrival, priorities=3))
+    assert [p.process_id for p in first] == list(range(1, 2001))
+    assert all(a.arrival_time <= b.arrival_time for a, b in zip(first, first[1:]))
+    assert all(1 <= p.burst_time <= 1000 for p in first)
+    assert all(16 <= p.memory_required <= 2048 for p in first)
+    assert {p.priority for p in first} == {0, 1, 2}
+
+
+def test_generated_workload_round_trips_through_json_lines(tmp_path):
+    path = str(tmp_path / "workload.jsonl")
+    write_json_lines(generate_processes(50, seed=1), path)
+
+    assert fields(read_processes(path)) == fields(generate_processes(50, seed=1))
@@ -0,0 +1,200 @@
+import json
+import struct
+import zipfile
+import numpy as np
+from process_table import FIELDS, MISSING
+
+
+MEMORY_EVENT_KINDS = ("split", "free", "merge", "divide", "compact")
+EVENT_LENGTHS = (4, 2, 2, 3, 1)  # Tuple length of each kind in MemoryTimeline events
+
+
+def write_trace(file_path, scheduler):
+    """
+    Write the results of a finished run to an uncompressed .npz file of flat columns:
+        process.*   one row per completed or rejected process, by process id (MISSING = -1 for unset
+                    results, process.rejected = 1 for rejected processes)
+        segment.*   run segments ordered by start time: process_id (-1 = idle), start, end, core, plus
+                    end_max (running maximum of end) and pid_order/pid_sorted indexes for lookups
+        memory.*    memory timeline events in order: time, kind (index into MEMORY_EVENT_KINDS),
+                    address, size, process_id (-1 where not applicable)
+        layout.*    the memory layout before the first event: start, size, free, process_id
+        meta        JSON with the stats, final time and configuration
+    Columns are stored uncompressed so TraceReader can memory-map them.
+    """
+    columns = {}
+    columns.update(process_columns(scheduler))
+    traces = [core.trace for core in scheduler.cores] if hasattr(scheduler, "cores") else [scheduler.trace]
+    columns.update(segment_columns(traces))
+    columns.update(memory_columns(scheduler.memory_manager.timeline, traces[0], scheduler.time))
+
+    meta = {
+        "time": scheduler.time,
+        "algorithm": scheduler.algorithm,
+        "time_quantum": scheduler.time_quantum,
+        "total_memory": scheduler.memory_manager.total_memory,
+        "strategy": scheduler.memory_manager.strategy,
+        "stats": scheduler.get_stats(),
+    }
+    columns["meta"] = np.array(json.dumps(meta))
+    np.savez(file_path, **columns)
+
+
+def process_columns(scheduler):
+    processes = list(scheduler.completed_processes) + list(scheduler.rejected_processes)
+    values = np.array([[MISSING if getattr(p, name) is None else getattr(p, name) for name in FIELDS]
+                       for p in processes], dtype=np.int64).reshape(-1, len(FIELDS))
+    rejected = np.zeros(len(processes), dtype=np.int8)
+    rejected[len(scheduler.completed_processes):] = 1
+
+    order = np.argsort(values[:, FIELDS.index("process_id")], kind="stable")
+    columns = {f"process.{name}": values[order, i] for i, name in enumerate(FIELDS)}
+    columns["process.rejected"] = rejected[order]
+    return columns
+
+
+def segment_columns(traces):
+    parts = []
+    for core, trace in enumerate(traces):
+        segments = np.array([(MISSING if process_id is None else process_id, start, end, core)
+                             for process_id, start, end in trace.segments], dtype=np.int64).reshape(-1, 4)
+        parts.append(segments)
+    segments = np.concatenate(parts)
+    segments = segments[np.argsort(segments[:, 1], kind="stable")]
+
+    pid_order = np.argsort(segments[:, 0], kind="stable")
+    return {
+        "segment.process_id": segments[:, 0],
+        "segment.start": segments[:, 1],
+        "segment.end": segments[:, 2],
+        "segment.core": segments[:, 3],
+        "segment.end_max": np.maximum.accumulate(segments[:, 2]) if len(segments) else segments[:, 2],
+        "segment.pid_order": pid_order,
+        "segment.pid_sorted": segments[pid_order, 0],
+    }
+
+
+def memory_columns(timeline, trace, end_time):
+    events = timeline.events
+    kinds = np.array([MEMORY_EVENT_KINDS.index(event[0]) for event in events], dtype=np.int8)
+    address = np.array([event[1] if len(event) > 1 else MISSING for event in events], dtype=np.int64)
+    size = np.array([event[2] if len(event) > 2 else MISSING for event in events], dtype=np.int64)
+    process_id = np.array([event[3] if len(event) > 3 else MISSING for event in events], dtype=np.int64)
+
+    # A change mark (time, position) says the first position events had happened by time, so each
+    # event is dated by the first mark past it; events after the last mark happened by the end of the run
+    mark_times = np.array([time for time, _ in trace.memory_changes] + [end_time], dtype=np.int64)
+    mark_positions = np.array([position for _, position in trace.memory_changes], dtype=np.int64)
+    times = mark_times[np.searchsorted(mark_positions, np.arange(len(events)), side="right")]
+
+    _, initial_layout = timeline.keyframes[0]
+    layout = np.array(initial_layout, dtype=object).reshape(-1, 4)
+    return {
+        "memory.time": times,
+        "memory.kind": kinds,
+        "memory.address": address,
+        "memory.size": size,
+        "memory.process_id": process_id,
+        "layout.start": layout[:, 0].astype(np.int64),
+        "layout.size": layout[:, 1].astype(np.int64),
+        "layout.free": layout[:, 2].astype(np.int8),
+        "layout.process_id": np.array([MISSING if pid is None else pid for pid in layout[:, 3]], dtype=np.int64),
+    }
+
+
+class TraceReader:
+    """
+    Memory-mapped access to a trace written by write_trace: columns are read from disk only where
+    they are sliced, so traces larger than RAM can be queried by time range or process id.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.columns = {}
+        with open(file_path, "rb") as f, zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{info.filename} is compressed and cannot be memory-mapped")
+                # The member's data follows its local header, whose name and extra field lengths vary
+                f.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack("<HH", f.read(4))
+                data_offset = info.header_offset + 30 + name_length + extra_length
+                f.seek(data_offset)
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                name = info.filename[:-len(".npy")]
+                if dtype.hasobject:
+                    raise ValueError(f"Column {name} holds Python objects")
+                if not shape or 0 in shape:
+                    # Scalars (meta) and empty columns are not worth mapping
+                    f.seek(data_offset)
+                    self.columns[name] = np.lib.format.read_array(f)
+                else:
+                    self.columns[name] = np.memmap(file_path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                                   order="F" if fortran_order else "C")
+        self.meta = json.loads(str(self.columns.pop("meta")[()]))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def table(self, prefix, rows):
+        return {name[len(prefix) + 1:]: column[rows] for name, column in self.columns.items()
+                if name.startswith(prefix + ".")}
+
+    def segments(self, start=None, end=None, process_id=None):
+        """
+        Columns of the segments overlapping [start, end) (the whole run if not given),
+        optionally only those of one process (-1 for idle).
+        """
+        if process_id is not None:
+            pid_sorted = self.columns["segment.pid_sorted"]
+            rows = np.sort(self.columns["segment.pid_order"][np.searchsorted(pid_sorted, process_id, "left"):
+                                                             np.searchsorted(pid_sorted, process_id, "right")])
+        else:
+            # Segments before first all end by start, segments from last on start at end or later
+            first = 0 if start is None else np.searchsorted(self.columns["segment.end_max"], start, "right")
+            last = None if end is None else np.searchsorted(self.columns["segment.start"], end, "left")
+            rows = slice(first, last)
+
+        segments = self.table("segment", rows)
+        keep = np.ones(len(segments["start"]), dtype=bool)
+        if start is not None:
+            keep &= segments["end"] > start
+        if end is not None:
+            keep &= segments["start"] < end
+        return {name: column[keep] for name, column in segments.items()
+                if name not in ("end_max", "pid_order", "pid_sorted")}
+
+    def processes(self, process_id=None):
+        """
+        Columns of all processes, or of the one with the given process id.
+        """
+        if process_id is None:
+            return self.table("process", slice(None))
+        process_ids = self.columns["process.process_id"]
+        row = np.searchsorted(process_ids, process_id)
+        if row == len(process_ids) or process_ids[row] != process_id:
+            raise KeyError(process_id)
+        return self.table("process", slice(row, row + 1))
+
+    def memory_events(self, start=None, end=None):
+        """
+        Columns of the memory events dated in [start, end).
+        """
+        times = self.columns["memory.time"]
+        first = 0 if start is None else np.searchsorted(times, start, "left")
+        last = len(times) if end is None else np.searchsorted(times, end, "left")
+        return self.table("memory", slice(first, last))
+
+    def iter_memory_events(self, start=None, end=None):
+        """
+        Yield the memory events dated in [start, end) as MemoryTimeline event tuples, e.g. to replay
+        them onto the layout.* columns with MemoryTimeline.apply.
+        """
+        events = self.memory_events(start, end)
+        for kind, address, size, process_id in zip(events["kind"].tolist(), events["address"].tolist(),
+                                                   events["size"].tolist(), events["process_id"].tolist()):
+            yield (MEMORY_EVENT_KINDS[kind], address, size, process_id)[:EVENT_LENGTHS[kind]]
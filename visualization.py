@@ -1,87 +1,180 @@
 import matplotlib.pyplot as plt
-from collections import defaultdict
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap, hsv_to_rgb
+from execution_trace import ExecutionLog
 
 
-def plot_gantt(execution_log, stats, rejected_processes):
+def plot_gantt(trace, stats, rejected_processes, core_traces=None, max_lanes=200, width=1000,
+               path="charts/processes.png"):
     """
     Plot a Gantt chart showing when each process is running,
     and append summary statistics below the chart.
+    trace is an ExecutionTrace (or an ExecutionLog of one). Processes get one compact lane each,
+    drawn as one collection per lane; with more than max_lanes processes the chart switches to a
+    density view (see gantt_density) whose size does not depend on the number of processes.
+    With core_traces (one ExecutionTrace per CPU) there is one lane per core instead of per process.
+    The chart is saved to path.
     """
-    fig, ax = plt.subplots(figsize=(10, 5))
-    process_colors = {}  # Assign a unique color for each process
-    execution_segments = defaultdict(list)  # Store execution times per process
-
-    # Group all time points where each process runs
-    for entry in execution_log:
-        process_id = entry["process_id"]
-        time = entry["time"]
-        if process_id not in process_colors:
-            process_colors[process_id] = f"C{process_id % 10}"  # Matplotlib color cycle
-        execution_segments[process_id].append(time)
-
-    # Convert time points into (start, duration) segments
-    for process_id, times in execution_segments.items():
-        times.sort()
-        grouped = []
-        start = times[0]
-        prev = times[0]
-        for t in times[1:]:
-            if t == prev + 1:
-                prev = t
-            else:
-                grouped.append((start, prev - start + 1))
-                start = t
-                prev = t
-        grouped.append((start, prev - start + 1))
-
-        y_pos = process_id * 10
-        for start_time, duration in grouped:
-            ax.broken_barh([(start_time, duration)], (y_pos, 2), facecolors=process_colors[process_id])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if core_traces is not None:
+        plot_core_lanes(ax, core_traces)
+        finish_gantt(fig, stats, rejected_processes, path)
+        return
+
+    if isinstance(trace, ExecutionLog):
+        trace = trace.trace
+    process_ids, starts, ends = trace_segments(trace)
+    # Compact lanes: the n-th smallest process id runs in lane n
+    lane_ids, lanes = np.unique(process_ids, return_inverse=True)
+
+    if len(lane_ids) > max_lanes:
+        density, lanes_per_row = gantt_density(lanes, starts, ends, rows=max_lanes, columns=width)
+        end = int(ends.max())
+        image = ax.imshow(density, cmap="viridis", vmin=0, vmax=1, origin="lower", aspect="auto",
+                          interpolation="nearest", extent=(0, end, 0, len(lane_ids)))
+        fig.colorbar(image, ax=ax, label="Share of CPU time")
+        ax.set_ylabel(f"Processes ({lanes_per_row} per row, by process ID)")
+        plt.title("Process Execution Density")
+    else:
+        order = np.argsort(lanes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(lanes[order])) + 1
+        colors = process_colors(lane_ids)
+        for lane, rows in enumerate(np.split(order, boundaries)):
+            if len(rows):
+                ax.broken_barh(np.column_stack((starts[rows], ends[rows] - starts[rows])), (lane, 0.8),
+                               facecolors=colors[lane])
+
+        # Label at most ~30 lanes
+        ticks = np.arange(0, len(lane_ids), max(1, len(lane_ids) // 30))
+        ax.set_yticks(ticks + 0.4)
+        ax.set_yticklabels(lane_ids[ticks].tolist())
+        ax.set_ylabel("Process ID")
+        plt.title("Process Execution Timeline")
 
     ax.set_xlabel("Time")
-    ax.set_ylabel("Process ID")
-    ax.set_yticks([pid * 10 + 2 for pid in process_colors])
-    ax.set_yticklabels(list(process_colors.keys()))
-    plt.title("Process Execution Timeline")
+    finish_gantt(fig, stats, rejected_processes, path)
+
+
+def trace_segments(trace):
+    """
+    (process_ids, starts, ends) arrays of the trace's run segments, idle time left out.
+    """
+    segments = np.array([segment for segment in trace.segments if segment[0] is not None],
+                        dtype=np.int64).reshape(-1, 3)
+    return segments[:, 0], segments[:, 1], segments[:, 2]
+
+
+def process_colors(process_ids):
+    """
+    A distinct RGB color per process id: hues spaced by the golden ratio so neighbours differ clearly.
+    """
+    hues = (np.asarray(process_ids) * 0.618033988749895) % 1.0
+    hsv = np.column_stack((hues, np.full(len(hues), 0.65), np.full(len(hues), 0.9)))
+    return hsv_to_rgb(hsv)
+
+
+def gantt_density(lanes, starts, ends, rows, columns):
+    """
+    Share of CPU time each group of lanes got, on a (rows x columns) grid of lane groups x time bins
+    (on one CPU each column adds up to the utilization in that bin).
+    Every segment adds its exact overlap with each time bin: partial first and last bins directly,
+    the bins in between through a difference array, so the cost is linear in the number of segments.
+    Returns the grid and the number of lanes per row.
+    """
+    end = int(ends.max()) if len(ends) else 0
+    lanes_per_row = -(-(int(lanes.max()) + 1) // rows) if len(lanes) else 1
+    rows = -(-(int(lanes.max()) + 1) // lanes_per_row) if len(lanes) else 0
+    columns = max(1, min(columns, end))
+    bin_width = end / columns if end else 1.0
+
+    row = lanes // lanes_per_row
+    first = np.minimum((starts / bin_width).astype(np.int64), columns - 1)
+    last = np.minimum((ends / bin_width).astype(np.int64), columns)  # Bin holding the end, columns if at the very end
+    busy = np.zeros((rows, columns + 1))
+    full = np.zeros((rows, columns + 1))
 
+    single = first == last
+    np.add.at(busy, (row[single], first[single]), (ends - starts)[single])
+    spread = ~single
+    np.add.at(busy, (row[spread], first[spread]), (first[spread] + 1) * bin_width - starts[spread])
+    np.add.at(busy, (row[spread], last[spread]), ends[spread] - last[spread] * bin_width)
+    np.add.at(full, (row[spread], first[spread] + 1), bin_width)
+    np.add.at(full, (row[spread], last[spread]), -bin_width)
+
+    busy = (busy + np.cumsum(full, axis=1))[:, :columns]
+    return busy / bin_width, lanes_per_row
+
+
+def plot_core_lanes(ax, core_traces):
+    """
+    Draw one lane per CPU, each run segment colored by its process. Lanes are labelled with the
+    CPU's utilization.
+    """
+    end = max((trace.segments[-1][2] for trace in core_traces if trace.segments), default=0)
+    labels = []
+    for core, trace in enumerate(core_traces):
+        process_ids, starts, ends = trace_segments(trace)
+        ax.broken_barh(np.column_stack((starts, ends - starts)), (core * 10, 8), facecolors=process_colors(process_ids))
+        labels.append(f"CPU {core}\n{(ends - starts).sum() / end if end else 0.0:.0%}")
+
+    ax.set_xlabel("Time")
+    ax.set_ylabel("CPU (utilization)")
+    ax.set_yticks([core * 10 + 4 for core in range(len(core_traces))])
+    ax.set_yticklabels(labels)
+    plt.title("Per-CPU Execution Timeline")
+
+
+def finish_gantt(fig, stats, rejected_processes, path, lines_per_column=8, max_rejected=8):
+    """
+    Add the statistics and rejected processes below the chart and save it.
+    """
     # Make room for stats below the plot
-    plt.subplots_adjust(bottom=0.25)
+    plt.subplots_adjust(bottom=0.3)
 
-    # Add statistics below the plot
+    # Add statistics below the plot, in columns of lines_per_column (longer ones if they would not fit in 4)
     if stats:
-        stat_text = "\n".join([f"{k}: {v:.2f}" for k, v in stats.items()])
-        fig.text(0.1, 0.02, "Summary Stats:\n" + stat_text, fontsize=10, ha="left")
+        stat_lines = [f"{k}: {v:.2f}" for k, v in stats.items()]
+        lines_per_column = max(lines_per_column, -(-len(stat_lines) // 4))
+        for column in range(0, len(stat_lines), lines_per_column):
+            title = "Summary Stats:" if column == 0 else ""
+            fig.text(0.05 + 0.25 * (column // lines_per_column), 0.02,
+                     "\n".join([title] + stat_lines[column:column + lines_per_column]), fontsize=8, ha="left")
 
     # Add rejected processes below if any
     if rejected_processes:
-        fig.text(0.99, 0.02, "Rejected_processes:\n" + rejected_processes, fontsize=10, ha="right")
+        rejected_lines = [f"PID: {p['process_id']} required memory: {p['memory_required']}"
+                          for p in rejected_processes[:max_rejected]]
+        if len(rejected_processes) > max_rejected:
+            rejected_lines.append(f"... and {len(rejected_processes) - max_rejected} more")
+        fig.text(0.99, 0.02, "Rejected_processes:\n" + "\n".join(rejected_lines), fontsize=8, ha="right")
 
     # Save as png
-    plt.savefig("charts/processes.png")
+    plt.savefig(path)
     plt.close()
 
 
-def plot_memory_timeline(execution_log):
+def plot_memory_timeline(trace, width=1000, height=600, path="charts/memory.png"):
     """
-    Plot memory allocation and deallocation over time.
-    Red blocks = allocated memory (with process_id), green = free memory.
+    Plot memory allocation and deallocation over time as one image: x is the memory address, y the time,
+    red = allocated and green = free, blended where a pixel covers both. Blocks big enough to read are
+    labelled with their PID. trace is an ExecutionTrace (or an ExecutionLog of one); the work done
+    depends on width x height, not on the length of the run (see memory_raster). The chart is saved to path.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    for entry in execution_log:
-        time = entry["time"]  # Snapshot time
-        for block in entry["memory_state"]:
-            start, size, is_free, process_id = block  # Unpack block info
-            color = 'green' if is_free else 'red'
-            label = "Free" if is_free else f"PID {process_id}"
-
-            # Draw memory block as horizontal bar at time line
-            ax.broken_barh([(start, size)], (time, 1), facecolors=color, edgecolors='black')
+    if isinstance(trace, ExecutionLog):
+        trace = trace.trace
+    raster, boundaries, labels, total_memory, end = memory_raster(trace, height, width)
 
-            # Annotate PID inside allocated blocks
-            if not is_free:
-                ax.text(start + size / 2, time + 0.3, label,
-                        ha='center', va='center', fontsize=7, color='white')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if raster.size:
+        colors = LinearSegmentedColormap.from_list("memory", ["green", "red"])
+        image = ax.imshow(raster, cmap=colors, vmin=0, vmax=1, origin="lower", aspect="auto",
+                          interpolation="nearest", extent=(0, total_memory, 0, end))
+        # Dark edges where an allocated block starts
+        ax.imshow(np.where(boundaries, 0.5, np.nan), cmap="gray", vmin=0, vmax=1, origin="lower", aspect="auto",
+                  interpolation="nearest", extent=(0, total_memory, 0, end))
+        fig.colorbar(image, ax=ax, label="Allocated share")
+        for address, time, process_id in labels:
+            ax.text(address, time, f"PID {process_id}", ha='center', va='center', fontsize=7, color='white')
 
     ax.set_xlabel("Memory Address")
     ax.set_ylabel("Time")
@@ -89,5 +182,81 @@ def plot_memory_timeline(execution_log):
     plt.tight_layout()
 
     # Save as png
-    plt.savefig("charts/memory.png")
+    plt.savefig(path)
     plt.close()
+
+
+def memory_raster(trace, rows, columns, min_label_rows=12, min_label_columns=40):
+    """
+    Rasterize the memory layouts of a trace into a (time x address) grid of allocated shares.
+    Each of the at most rows rows shows the layout in effect in the middle of its time span; only
+    those layouts are rebuilt, by seeking to the memory timeline's keyframes, and a layout that
+    repeats is not rasterized again. Columns hold the exact allocated share of their address range.
+    Returns (raster, boundaries, labels, total_memory, end_time): boundaries marks the pixels where an
+    allocated block at least 3 columns wide starts, labels are (address, time, process_id) for
+    blocks that cover at least min_label_columns x min_label_rows of the requested rows x columns
+    without changing.
+    """
+    end = trace.segments[-1][2] if trace.segments else 0
+    if not trace.memory_changes or end == 0:
+        return np.zeros((0, 0)), np.zeros((0, 0), dtype=bool), [], 0, end
+
+    min_label_time = min_label_rows * end / rows
+    rows = min(rows, end)
+    row_height = end / rows
+    change_times = np.array([time for time, _ in trace.memory_changes])
+    # Index of the layout change in effect at each row's midpoint, ascending
+    changes = np.searchsorted(change_times, (np.arange(rows) + 0.5) * row_height, side="right") - 1
+    first_rows = np.flatnonzero(np.diff(changes, prepend=-2))
+    first_rows = first_rows[changes[first_rows] >= 0]
+    positions = [trace.memory_changes[change][1] for change in changes[first_rows]]
+
+    raster = boundaries = None
+    edges = None
+    labels = []
+    open_blocks = {}  # Labelable block -> first row it was seen in
+    previous = None
+    profile = None
+    row_ends = np.append(first_rows[1:], rows)
+
+    def close(block, last_row):
+        first_row = open_blocks.pop(block)
+        if (last_row - first_row) * row_height >= min_label_time:
+            start, size, process_id = block
+            labels.append((start + size / 2, (first_row + last_row) / 2 * row_height, process_id))
+
+    for first_row, last_row, layout in zip(first_rows.tolist(), row_ends.tolist(),
+                                           trace.memory_timeline.layouts(positions)):
+        if raster is None:
+            total_memory = sum(size for _, size, _, _ in layout)
+            min_label_size = min_label_columns * total_memory / columns
+            columns = min(columns, total_memory)
+            raster = np.zeros((rows, columns))
+            boundaries = np.zeros((rows, columns), dtype=bool)
+            edges = np.linspace(0, total_memory, columns + 1)
+
+        if layout != previous:
+            starts = np.array([start for start, _, _, _ in layout], dtype=float)
+            used = np.array([0 if is_free else size for _, size, is_free, _ in layout], dtype=float)
+            # Allocated bytes below each address grow linearly inside used blocks
+            allocated_below = np.interp(edges, np.append(starts, total_memory), np.append(0, np.cumsum(used)))
+            profile = np.diff(allocated_below) / np.diff(edges)
+            sizes = np.array([size for _, size, _, _ in layout])
+            wide = (used > 0) & (sizes * columns >= 3 * total_memory)
+            block_starts = (starts[wide] * columns / total_memory).astype(int)
+            previous = layout
+        raster[first_row:last_row] = profile
+        boundaries[first_row:last_row, block_starts] = True
+
+        current = {(start, size, process_id) for start, size, is_free, process_id in layout
+                   if not is_free and size >= min_label_size}
+        for block in [block for block in open_blocks if block not in current]:
+            close(block, first_row)
+        for block in current:
+            open_blocks.setdefault(block, first_row)
+
+    for block in list(open_blocks):
+        close(block, rows)
+    if raster is None:
+        return np.zeros((0, 0)), np.zeros((0, 0), dtype=bool), [], 0, end
+    return raster, boundaries, labels, total_memory, end
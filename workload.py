@@ -0,0 +1,222 @@
+import heapq
+import json
+import random
+from bisect import bisect
+from itertools import accumulate, count
+from process import Process
+
+
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+ARRIVAL_PATTERNS = ("poisson", "bursty")
+# Memory size mixture as (weight, low, high, step) components: sizes low, low + step, ... up to high.
+# Mostly a few common small sizes (slab friendly), then arbitrary small/medium sizes and rare large ones.
+DEFAULT_MEMORY_MIX = ((0.5, 32, 128, 32), (0.35, 16, 512, 1), (0.15, 512, 2048, 1))
+
+
+class WorkloadError(ValueError):
+    """
+    Raised for malformed or badly ordered workload input.
+    """
+
+
+def process_from_dict(data):
+    """
+    Build a Process from one entry of the input file.
+    """
+    return Process(
+        process_id=data["process_id"],
+        arrival_time=data["arrival_time"],
+        burst_time=data["burst_time"],
+        memory_required=data["memory_required"],
+        priority=data.get("priority", 0)
+    )
+
+
+def read_processes(file_path, chunk_size=1 << 16):
+    """
+    Lazily yield the processes of a workload file, one at a time.
+    .jsonl/.ndjson files hold one process object per line, anything else is parsed
+    incrementally as {"processes": [...]}, so the whole file is never held in memory.
+    """
+    with open(file_path, "r") as f:
+        if file_path.endswith(JSON_LINES_EXTENSIONS):
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_processes(f, chunk_size)
+
+
+def iter_json_lines(f):
+    """
+    Yield a process for every non-blank line of a JSON Lines file.
+    """
+    for line in f:
+        if line.strip():
+            yield process_from_dict(json.loads(line))
+
+
+def iter_json_processes(f, chunk_size=1 << 16):
+    """
+    Yield the entries of the "processes" array of a JSON object as they are parsed.
+    Other top-level keys before the array are skipped, anything after it is not read.
+    """
+    reader = StreamingDecoder(f, chunk_size)
+    reader.expect("{")
+    if not reader.next_is("}"):
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "processes":
+                reader.expect("[")
+                if reader.next_is("]"):
+                    return
+                while True:
+                    yield process_from_dict(reader.value())
+                    if reader.expect(",]") == "]":
+                        return
+            reader.value()
+            if reader.expect(",}") == "}":
+                break
+    raise KeyError("processes")
+
+
+class StreamingDecoder:
+    """
+    Decodes JSON values and structural characters from a file read in chunks.
+    Only the unparsed tail of the input is buffered.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.file = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Read the next chunk, dropping what was already parsed. Returns False at end of file.
+        """
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\r\n":
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return
+
+    def next_is(self, character):
+        """
+        Consume the next non-whitespace character if it is the given one.
+        """
+        self.skip_whitespace()
+        if self.position < len(self.buffer) and self.buffer[self.position] == character:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, characters):
+        """
+        Consume and return the next non-whitespace character, which must be one of characters.
+        """
+        self.skip_whitespace()
+        if self.position >= len(self.buffer):
+            raise WorkloadError(f"Unexpected end of input, expected one of {characters!r}")
+        character = self.buffer[self.position]
+        if character not in characters:
+            raise WorkloadError(f"Expected one of {characters!r}, got {character!r}")
+        self.position += 1
+        return character
+
+    def value(self):
+        """
+        Decode the next complete JSON value.
+        """
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A value running up to the end of the buffer (e.g. a number) may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def arrival_ordered(processes, window=0):
+    """
+    Yield processes in arrival order, checking the order on the fly.
+    Up to window processes are buffered so slightly out-of-order input gets sorted (ties keep
+    input order); a process that arrives before one that was already yielded raises WorkloadError.
+    """
+    buffer = []  # (arrival_time, input order, process)
+    sequence = count()
+    last_arrival = None
+
+    def pop():
+        nonlocal last_arrival
+        arrival_time, _, process = heapq.heappop(buffer)
+        if last_arrival is not None and arrival_time < last_arrival:
+            raise WorkloadError(
+                f"Process {process.process_id} arrives at {arrival_time}, before already scheduled arrival "
+                f"{last_arrival}; input is more than {window} processes out of order")
+        last_arrival = arrival_time
+        return process
+
+    for process in processes:
+        heapq.heappush(buffer, (process.arrival_time, next(sequence), process))
+        if len(buffer) > window:
+            yield pop()
+    while buffer:
+        yield pop()
+
+
+def generate_processes(count, seed=None, arrival="poisson", rate=0.2, burst_factor=10, burst_length=50,
+                       burst_alpha=1.5, min_burst=1, max_burst=1000, memory_mix=DEFAULT_MEMORY_MIX, priorities=1):
+    """
+    Lazily yield count synthetic processes in arrival order; the same seed gives the same workload.
+
+    Arrivals are "poisson" (exponential gaps, rate arrivals per time unit on average) or "bursty": the
+    rate alternates between rate * burst_factor and rate / burst_factor in phases of burst_length
+    arrivals on average. Burst times are Pareto distributed with shape burst_alpha (heavy tailed, a
+    smaller shape means a heavier tail), scaled by min_burst and capped at max_burst. Memory sizes come
+    from the memory_mix components (see DEFAULT_MEMORY_MIX), priorities uniformly from 0 to priorities - 1.
+    """
+    if arrival not in ARRIVAL_PATTERNS:
+        raise ValueError(f"Unsupported arrival pattern: {arrival}")
+    rng = random.Random(seed)
+    cumulative_weights = list(accumulate(weight for weight, _, _, _ in memory_mix))
+
+    clock = 0.0
+    current_rate = rate
+    for process_id in range(1, count + 1):
+        if arrival == "bursty" and rng.random() < 1 / burst_length:
+            # Switch between a burst and a lull
+            current_rate = rate / burst_factor if current_rate > rate else rate * burst_factor
+        clock += rng.expovariate(current_rate)
+
+        burst_time = min(max_burst, int(min_burst * rng.paretovariate(burst_alpha)))
+        _, low, high, step = memory_mix[bisect(cumulative_weights, rng.random() * cumulative_weights[-1])]
+        memory_required = low + step * rng.randint(0, (high - low) // step)
+        yield Process(process_id, int(clock), burst_time, memory_required, rng.randrange(priorities))
+
+
+def write_json_lines(processes, file_path):
+    """
+    Write processes to a JSON Lines file that read_processes can stream back.
+    """
+    with open(file_path, "w") as f:
+        for p in processes:
+            f.write(json.dumps({"process_id": p.process_id, "arrival_time": p.arrival_time,
+                                "burst_time": p.burst_time, "memory_required": p.memory_required,
+                                "priority": p.priority}) + "\n")